@@ -1,6 +1,7 @@
 import torch
 import numpy as np
 import math # Needed for ceiling calculation in rounding
+from .instrumentation import log
 
 class BETACrop:
     """
@@ -127,7 +128,7 @@ class BETAStitch:
 
     def stitch_video(self, original_frames, cropped_frames, crop_info):
         if cropped_frames is None or crop_info is None or original_frames is None:
-            print("Warning: BETAStitch missing required inputs. Returning None.")
+            log("warning", "Warning: BETAStitch missing required inputs. Returning None.")
             return (None,)
 
         try:
@@ -136,10 +137,10 @@ class BETAStitch:
             # Crop info width/height *should* match the cropped_frames dimensions
             # We rely on cropped_frames.shape for the actual dimensions to stitch
         except KeyError as e:
-            print(f"Error: BETAStitch missing key in crop_info: {e}. Returning original frames.")
+            log("error", f"Error: BETAStitch missing key in crop_info: {e}. Returning original frames.")
             return (original_frames,)
         except TypeError:
-             print(f"Error: BETAStitch expects crop_info to be a dictionary. Got {type(crop_info)}. Returning original frames.")
+             log("error", f"Error: BETAStitch expects crop_info to be a dictionary. Got {type(crop_info)}. Returning original frames.")
              return (original_frames,)
 
         num_original_frames, full_height, full_width, _ = original_frames.shape
@@ -148,12 +149,12 @@ class BETAStitch:
         num_frames = min(num_original_frames, num_cropped_frames)
 
         if num_frames == 0:
-             print("Warning: BETAStitch received zero frames to process. Returning None.")
+             log("warning", "Warning: BETAStitch received zero frames to process. Returning None.")
              return (None,)
 
         # Validate stitch coordinates using the actual cropped frame dimensions
         if x < 0 or y < 0 or (x + cropped_width) > full_width or (y + cropped_height) > full_height:
-            print(f"Error: BETAStitch - Crop dimensions derived from input tensor [{cropped_width}x{cropped_height}] at ({x},{y}) would exceed original dimensions [{full_width}x{full_height}]. Returning original frames.")
+            log("error", f"Error: BETAStitch - Crop dimensions derived from input tensor [{cropped_width}x{cropped_height}] at ({x},{y}) would exceed original dimensions [{full_width}x{full_height}]. Returning original frames.")
             return (original_frames[:num_frames].clone(),)
 
         end_x = x + cropped_width
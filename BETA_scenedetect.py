@@ -1,10 +1,12 @@
-import torch
-import numpy as np
-import cv2
 import tempfile
 import os
-from scenedetect import open_video, SceneManager
-from scenedetect.detectors import ContentDetector
+from .lazy_imports import lazy_module
+from .instrumentation import log, phase
+from .image_convert import FrameConverter
+
+cv2 = lazy_module("cv2")
+scenedetect = lazy_module("scenedetect")
+scenedetect_detectors = lazy_module("scenedetect.detectors")
 
 
 class BETASceneDetect:
@@ -15,7 +17,7 @@ class BETASceneDetect:
     MAX_SCENES = 5  # Fixed maximum number of scene outputs
     
     def __init__(self):
-        pass
+        self.converter = FrameConverter() # Reused uint8 buffers for the temporary video
 
     @classmethod
     def INPUT_TYPES(cls):
@@ -60,37 +62,20 @@ class BETASceneDetect:
         video_writer = cv2.VideoWriter(temp_video_path, fourcc, fps, (width, height))
         
         if not video_writer.isOpened():
-            print(f"Error: Could not open video writer for {temp_video_path}")
+            log("error", f"Error: Could not open video writer for {temp_video_path}")
             return False
         
         try:
-            # Convert each frame and write to video
-            for i in range(batch_size):
-                frame = images[i]
-                
-                # Convert from torch tensor to numpy array
-                if isinstance(frame, torch.Tensor):
-                    frame_np = frame.cpu().numpy()
-                else:
-                    frame_np = frame
-                
-                # Ensure the image is in the correct format (0-255, uint8)
-                if frame_np.dtype != np.uint8:
-                    frame_np = (np.clip(frame_np, 0, 1) * 255).astype(np.uint8)
-                
-                # Convert RGB to BGR for OpenCV
-                if len(frame_np.shape) == 3 and frame_np.shape[2] == 3:
-                    frame_bgr = cv2.cvtColor(frame_np, cv2.COLOR_RGB2BGR)
-                else:
-                    frame_bgr = frame_np
-                
-                video_writer.write(frame_bgr)
+            # Convert chunk by chunk (clamp, scale, RGB -> BGR for OpenCV) into reused buffers
+            for _, frames_bgr, _ in self.converter.iter_chunks(images, channel_order="BGR"):
+                for frame_bgr in frames_bgr:
+                    video_writer.write(frame_bgr)
             
             video_writer.release()
             return True
             
         except Exception as e:
-            print(f"Error writing video: {e}")
+            log("error", f"Error writing video: {e}")
             video_writer.release()
             return False
 
@@ -123,15 +108,18 @@ class BETASceneDetect:
         
         try:
             # Convert images to temporary video file
-            if not self._images_to_video(images, temp_video_path):
+            with phase("encode", frames=batch_size):
+                encoded = self._images_to_video(images, temp_video_path)
+            if not encoded:
                 return tuple([None] * 5) + (None, None, "Failed to create temporary video", 0)
             
             # Use PySceneDetect to detect scenes
-            video = open_video(temp_video_path)
-            scene_manager = SceneManager()
-            scene_manager.add_detector(ContentDetector(threshold=threshold))
-            scene_manager.detect_scenes(video, show_progress=False)
-            scene_list = scene_manager.get_scene_list()
+            with phase("detect", frames=batch_size):
+                video = scenedetect.open_video(temp_video_path)
+                scene_manager = scenedetect.SceneManager()
+                scene_manager.add_detector(scenedetect_detectors.ContentDetector(threshold=threshold))
+                scene_manager.detect_scenes(video, show_progress=False)
+                scene_list = scene_manager.get_scene_list()
             
             # Extract scene boundaries and individual scene batches
             # Note: PySceneDetect returns scenes where end_time is the start of the next scene
@@ -242,7 +230,7 @@ class BETASceneDetect:
             return tuple(scene_outputs) + (remaining_frames, scene_frames, scene_summary, scene_count)
             
         except Exception as e:
-            print(f"Error in scene detection: {e}")
+            log("error", f"Error in scene detection: {e}")
             import traceback
             traceback.print_exc()
             return tuple([None] * 5) + (None, None, f"Error: {str(e)}", 0)
@@ -253,7 +241,7 @@ class BETASceneDetect:
                 if os.path.exists(temp_video_path):
                     os.remove(temp_video_path)
             except Exception as e:
-                print(f"Warning: Could not delete temporary video file {temp_video_path}: {e}")
+                log("warning", f"Warning: Could not delete temporary video file {temp_video_path}: {e}")
 
 
 # Node Mappings
@@ -1,117 +1,72 @@
 """
 Custom Nodes for ComfyUI - BETA Helpernodes (includes Crop, Audio, Image nodes)
 """
-
-# 3. Define the mappings for the NEW node(s) added in THIS __init__.py
-NEW_CLASS_MAPPINGS = {}
-NEW_DISPLAY_NAME_MAPPINGS = {}
-
-
-# 1. Import mappings from existing node files (Crop, Audio)
-from .BETA_cropnodes import NODE_CLASS_MAPPINGS as CROP_CLASS_MAPPINGS
-from .BETA_cropnodes import NODE_DISPLAY_NAME_MAPPINGS as CROP_DISPLAY_MAPPINGS
-# Assuming audio saver is in audio_saver.py and defines its own mappings or class
-try:
-    # Import class directly if mappings aren't exported from audio_saver
-    from .audio_saver import SaveAudioAdvanced
-    AUDIO_CLASS_MAPPINGS = {"SaveAudioAdvanced_BETA": SaveAudioAdvanced}
-    AUDIO_DISPLAY_MAPPINGS = {"SaveAudioAdvanced_BETA": "Save Audio Advanced 🔊 🅑🅔🅣🅐"}
-except ImportError:
-    print("[ComfyUI-BETA-Helpernodes] Warning: Could not import audio_saver node.")
-    AUDIO_CLASS_MAPPINGS = {}
-    AUDIO_DISPLAY_MAPPINGS = {}
-
-
-# 2. Import the new node class(es) from your new file(s)
-try: # Import the new classes
-    from .sharpness_clipper import SharpestFrameClipper, SelectSharpestFrames
-except ImportError:
-    print("[ComfyUI-BETA-Helpernodes] Warning: Could not import sharpness_clipper nodes.")
-    SharpestFrameClipper = None
-    SelectSharpestFrames = None
-
-# Import and define LoadTextFromIndex before using it
-try:
-    from .load_text_node import LoadTextFromIndex
-except ImportError:
-    print("[ComfyUI-BETA-Helpernodes] Warning: Could not import load text node.")
-    LoadTextFromIndex = None
-
-# Import the IndexedLoRALoader node
-try:
-    from .indexed_lora_loader import IndexedLoRALoader
-except ImportError:
-    print("[ComfyUI-BETA-Helpernodes] Warning: Could not import indexed lora loader node.")
-    IndexedLoRALoader = None
-
-# Import the TextLineCount node
-try:
-    from .text_line_count import TextLineCount
-except ImportError:
-    print("[ComfyUI-BETA-Helpernodes] Warning: Could not import text_line_count node.")
-    TextLineCount = None
-
-# Import the WAN Resolution Calculator node
-try:
-    from .wan_calculator import WANResolutionCalculator
-except ImportError:
-    print("[ComfyUI-BETA-Helpernodes] Warning: Could not import wan_calculator node.")
-    WANResolutionCalculator = None
-
-# Import the Scene Detection node
-try:
-    from .BETA_scenedetect import BETASceneDetect
-except ImportError:
-    print("[ComfyUI-BETA-Helpernodes] Warning: Could not import scene detection node.")
-    BETASceneDetect = None
-
-# Add TextLineCount if imported successfully
-if TextLineCount:
-    NEW_CLASS_MAPPINGS["TextLineCount_BETA"] = TextLineCount
-    NEW_DISPLAY_NAME_MAPPINGS["TextLineCount_BETA"] = "Text line count 🅑🅔🅣🅐"
-
-# Add sharpness clipper if imported successfully
-if SharpestFrameClipper:
-    NEW_CLASS_MAPPINGS["SharpestFrameClipper_BETA"] = SharpestFrameClipper
-    # Applying naming convention: Use scissors emoji ✂️
-    NEW_DISPLAY_NAME_MAPPINGS["SharpestFrameClipper_BETA"] = "Clip to Sharpest Frame ✂️ 🅑🅔🅣🅐"
-
-# Add select sharpest frames if imported successfully
-if SelectSharpestFrames:
-    NEW_CLASS_MAPPINGS["SelectSharpestFrames_BETA"] = SelectSharpestFrames
-    # Applying naming convention: Use target emoji 🎯
-    NEW_DISPLAY_NAME_MAPPINGS["SelectSharpestFrames_BETA"] = "Select Sharpest Frames 🎯 🅑🅔🅣🅐"
-
-if LoadTextFromIndex:
-    NEW_CLASS_MAPPINGS["LoadTextFromIndex_BETA"] = LoadTextFromIndex
-    NEW_DISPLAY_NAME_MAPPINGS["LoadTextFromIndex_BETA"] = "Load Text from index 📼 🅑🅔🅣🅐"
-
-if IndexedLoRALoader:
-    NEW_CLASS_MAPPINGS["IndexedLoRALoader_BETA"] = IndexedLoRALoader
-    NEW_DISPLAY_NAME_MAPPINGS["IndexedLoRALoader_BETA"] = "Indexed LoRA Loader 🎯 🅑🅔🅣🅐"
-
-# Add WAN Resolution Calculator if imported successfully
-if WANResolutionCalculator:
-    NEW_CLASS_MAPPINGS["WANResolutionCalculator_BETA"] = WANResolutionCalculator
-    NEW_DISPLAY_NAME_MAPPINGS["WANResolutionCalculator_BETA"] = "WAN Resolution Calculator 📏 🅑🅔🅣🅐"
-
-# Add Scene Detection node if imported successfully
-if BETASceneDetect:
-    NEW_CLASS_MAPPINGS["BETASceneDetect_BETA"] = BETASceneDetect
-    NEW_DISPLAY_NAME_MAPPINGS["BETASceneDetect_BETA"] = "Scene detect & split 🎥 🅑🅔🅣🅐"
-
-
-# 4. Combine the mappings from all sources
-NODE_CLASS_MAPPINGS ={
-    **CROP_CLASS_MAPPINGS,
-    **AUDIO_CLASS_MAPPINGS,
-    **NEW_CLASS_MAPPINGS # Add mappings defined here
-}
-NODE_DISPLAY_NAME_MAPPINGS = {
-    **CROP_DISPLAY_MAPPINGS,
-    **AUDIO_DISPLAY_MAPPINGS,
-    **NEW_DISPLAY_NAME_MAPPINGS # Add display names defined here
-}
+import importlib
+import time
+
+from .lazy_imports import is_available
+from .instrumentation import instrument_node, log
+
+# 1. Node registry: module, third-party dependencies it needs, and its nodes as
+#    {node key: (class name, display name)}.
+# Node modules only declare their classes at import time; heavy libraries
+# (cv2, scenedetect, torchaudio, comfy.sd, safetensors) are imported lazily on
+# first execution, so the dependency check uses find_spec instead of importing.
+NODE_REGISTRY = [
+    ("BETA_cropnodes", (), {
+        "BETACrop": ("BETACrop", "Video Crop 📼 🅑🅔🅣🅐"),
+        "BETAStitch": ("BETAStitch", "Video Stitch 📼 🅑🅔🅣🅐"),
+    }),
+    ("audio_saver", ("torchaudio",), {
+        "SaveAudioAdvanced_BETA": ("SaveAudioAdvanced", "Save Audio Advanced 🔊 🅑🅔🅣🅐"),
+    }),
+    ("text_line_count", (), {
+        "TextLineCount_BETA": ("TextLineCount", "Text line count 🅑🅔🅣🅐"),
+        "TextLineSelect_BETA": ("TextLineSelect", "Text line select 🅑🅔🅣🅐"),
+    }),
+    ("sharpness_clipper", ("cv2",), {
+        # Applying naming convention: Use scissors emoji ✂️
+        "SharpestFrameClipper_BETA": ("SharpestFrameClipper", "Clip to Sharpest Frame ✂️ 🅑🅔🅣🅐"),
+        # Applying naming convention: Use target emoji 🎯
+        "SelectSharpestFrames_BETA": ("SelectSharpestFrames", "Select Sharpest Frames 🎯 🅑🅔🅣🅐"),
+    }),
+    ("load_text_node", (), {
+        "LoadTextFromIndex_BETA": ("LoadTextFromIndex", "Load Text from index 📼 🅑🅔🅣🅐"),
+        "LoadTextBatchFromIndex_BETA": ("LoadTextBatchFromIndex", "Load Text batch from index 📼 🅑🅔🅣🅐"),
+        "LoadTextFromRecordIndex_BETA": ("LoadTextFromRecordIndex", "Load Text record from file 📼 🅑🅔🅣🅐"),
+    }),
+    ("indexed_lora_loader", ("safetensors",), {
+        "IndexedLoRALoader_BETA": ("IndexedLoRALoader", "Indexed LoRA Loader 🎯 🅑🅔🅣🅐"),
+    }),
+    ("wan_calculator", (), {
+        "WANResolutionCalculator_BETA": ("WANResolutionCalculator", "WAN Resolution Calculator 📏 🅑🅔🅣🅐"),
+    }),
+    ("BETA_scenedetect", ("cv2", "scenedetect"), {
+        "BETASceneDetect_BETA": ("BETASceneDetect", "Scene detect & split 🎥 🅑🅔🅣🅐"),
+    }),
+]
+
+# 2. Import each module (timed) and collect the mappings. Each node's FUNCTION is
+#    wrapped by the profiler (see instrumentation.py, GET /beta_helpernodes/profile).
+NODE_CLASS_MAPPINGS = {}
+NODE_DISPLAY_NAME_MAPPINGS = {}
+IMPORT_TIMES_MS = {} # module -> import time in milliseconds
+
+for module_name, dependencies, nodes in NODE_REGISTRY:
+    missing = [dependency for dependency in dependencies if not is_available(dependency)]
+    if missing:
+        log("warning", f"[ComfyUI-BETA-Helpernodes] Warning: Skipping {module_name} nodes, missing dependencies: {', '.join(missing)}")
+        continue
+    start = time.perf_counter()
+    try:
+        module = importlib.import_module(f".{module_name}", __name__)
+    except ImportError as e:
+        log("warning", f"[ComfyUI-BETA-Helpernodes] Warning: Could not import {module_name} nodes: {e}")
+        continue
+    IMPORT_TIMES_MS[module_name] = (time.perf_counter() - start) * 1000
+    for node_key, (class_name, display_name) in nodes.items():
+        NODE_CLASS_MAPPINGS[node_key] = instrument_node(node_key, getattr(module, class_name))
+        NODE_DISPLAY_NAME_MAPPINGS[node_key] = display_name
 
 # --- Optional Metadata and Exports ---
 WEB_DIRECTORY = "./js"
@@ -121,11 +76,12 @@ __version__ = "1.3.0" # Incremented version for IndexedLoRALoader
 __all__ = ['NODE_CLASS_MAPPINGS', 'NODE_DISPLAY_NAME_MAPPINGS', 'WEB_DIRECTORY']
 
 # --- Print confirmation message ---
-print("--------------------------------------")
-print("--- ComfyUI-BETA-Helpernodes ---")
-print(f"--- Version: {__version__} ---")
-print("--------------------------------------")
+log("info", "--------------------------------------")
+log("info", "--- ComfyUI-BETA-Helpernodes ---")
+log("info", f"--- Version: {__version__} ---")
+log("info", "--------------------------------------")
 # List loaded nodes dynamically from the final mappings
 loaded_node_names = list(NODE_DISPLAY_NAME_MAPPINGS.values())
-print(f"Nodes loaded ({len(loaded_node_names)}): {', '.join(loaded_node_names)}")
-print("--------------------------------------")
+log("info", f"Nodes loaded ({len(loaded_node_names)}): {', '.join(loaded_node_names)}")
+log("info", f"Import times: {', '.join(f'{name} {ms:.1f} ms' for name, ms in IMPORT_TIMES_MS.items())} (total {sum(IMPORT_TIMES_MS.values()):.1f} ms)")
+log("info", "--------------------------------------")
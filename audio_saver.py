@@ -1,17 +1,291 @@
 # audio_saver.py
 
 import torch
-import torchaudio
 import os
+import re
+import uuid
+import threading
+import traceback
 import folder_paths
 import numpy as np
 import datetime
+import wave
+import functools
+from concurrent.futures import ThreadPoolExecutor, wait
+from .lazy_imports import lazy_module, is_available
+from .instrumentation import log, log_enabled
+
+torchaudio = lazy_module("torchaudio")
+soundfile = lazy_module("soundfile") # Optional; streaming falls back to the stdlib wave module (PCM WAV only)
+
+# --- Background Encoding ---
+# Encoding (FLAC level 8, MP3) of long tracks can take seconds; in async mode it runs
+# on this pool so the prompt executor can move on. The semaphore bounds the number of
+# queued snapshots, so a fast producer blocks instead of piling waveforms up in RAM.
+ASYNC_SAVE_WORKERS = 2
+ASYNC_SAVE_MAX_PENDING = 8
+BATCH_SAVE_WORKERS = 4 # Parallel encoders for synchronous batch / multi-format saves
+AUDIO_FORMATS = ["flac", "wav", "mp3"]
+
+_SAVE_EXECUTOR = None
+_SAVE_SLOTS = threading.BoundedSemaphore(ASYNC_SAVE_MAX_PENDING)
+_PENDING_SAVES = set()
+_PENDING_LOCK = threading.Lock()
+
+
+def _get_save_executor():
+    global _SAVE_EXECUTOR
+    with _PENDING_LOCK:
+        if _SAVE_EXECUTOR is None:
+            _SAVE_EXECUTOR = ThreadPoolExecutor(max_workers=ASYNC_SAVE_WORKERS, thread_name_prefix="beta-audio-save")
+        return _SAVE_EXECUTOR
+
+
+def _on_save_done(future, filepath):
+    with _PENDING_LOCK:
+        _PENDING_SAVES.discard(future)
+    _SAVE_SLOTS.release()
+    error = future.exception()
+    if error is not None:
+        log("error", f"[SaveAudioAdvanced] Error: background save of {filepath} failed: {error}")
+        log("error", "".join(traceback.format_exception(type(error), error, error.__traceback__)))
+    else:
+        log("info", f"[SaveAudioAdvanced] Background save finished: {filepath}")
+
+
+def submit_save(fn, filepath, *args):
+    """Queues fn(filepath, *args) on the background pool; blocks while the pending queue is full."""
+    _SAVE_SLOTS.acquire()
+    try:
+        future = _get_save_executor().submit(fn, filepath, *args)
+    except Exception:
+        _SAVE_SLOTS.release()
+        raise
+    with _PENDING_LOCK:
+        _PENDING_SAVES.add(future)
+    future.add_done_callback(lambda f: _on_save_done(f, filepath))
+    return future
+
+
+def flush_pending_saves(timeout=None):
+    """
+    Barrier: waits until all queued background saves are written.
+    Returns the number of saves still pending (0 unless the timeout expired).
+    """
+    with _PENDING_LOCK:
+        pending = list(_PENDING_SAVES)
+    if pending:
+        log("info", f"[SaveAudioAdvanced] Waiting for {len(pending)} pending background save(s)...")
+        wait(pending, timeout=timeout)
+    return sum(1 for f in pending if not f.done())
+
+
+def _int_to_float(waveform):
+    """Scales an integer waveform to float in [-1, 1]."""
+    try:
+        dtype_info = torch.iinfo(waveform.dtype); max_val = dtype_info.max; min_val = dtype_info.min
+        if min_val < 0: return waveform.float() / max(abs(max_val), abs(min_val))
+        return (waveform.float() / max_val) * 2.0 - 1.0
+    except TypeError: return waveform.float() # Fallback
+
+
+def _compute_filename_vars(filename_prefix, width=0, height=0):
+    """
+    Substitutes the %width%/%height%/%year%/.../%second% variables like the compute_vars
+    helper inside folder_paths.get_save_image_path, without that function's folder scan.
+    """
+    now = datetime.datetime.now()
+    for name, value in (("width", width), ("height", height), ("year", now.year)):
+        filename_prefix = filename_prefix.replace(f"%{name}%", str(value))
+    for name, value in (("month", now.month), ("day", now.day), ("hour", now.hour), ("minute", now.minute), ("second", now.second)):
+        filename_prefix = filename_prefix.replace(f"%{name}%", str(value).zfill(2))
+    return filename_prefix
+
+
+# --- Output Counters ---
+class OutputCounterIndex:
+    """
+    Next free file counter per (folder, prefix), so a save doesn't list the whole
+    output folder. Seeded once by a scan; reservations are handed out under a lock
+    (safe for batch, multi-format and async saves). The folder mtime is recorded
+    after our own writes, and a different mtime on the next reservation means an
+    outside change, which triggers a rescan.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {} # (folder, prefix) -> {"next": int, "mtime_ns": int or None}
+
+    @staticmethod
+    def _key(folder, prefix):
+        return os.path.normcase(os.path.abspath(folder)), os.path.normcase(prefix)
+
+    @staticmethod
+    def _scan(folder, prefix):
+        """Highest existing counter for 'prefix_00001...' style names in folder."""
+        pattern = re.compile(re.escape(os.path.normcase(prefix)) + r"_(\d+)")
+        highest = 0
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                match = pattern.match(os.path.normcase(entry.name))
+                if match:
+                    highest = max(highest, int(match.group(1)))
+        return highest
+
+    def reserve(self, folder, prefix, count=1, extensions=()):
+        """Reserves 'count' consecutive counters and returns the first one."""
+        key = self._key(folder, prefix)
+        with self._lock:
+            os.makedirs(folder, exist_ok=True)
+            mtime_ns = os.stat(folder).st_mtime_ns
+            entry = self._entries.get(key)
+            if entry is None or entry["mtime_ns"] != mtime_ns:
+                # Never go below our own reservations, their (async) files may not exist yet
+                floor = entry["next"] if entry is not None else 1
+                entry = {"next": max(floor, self._scan(folder, prefix) + 1), "mtime_ns": mtime_ns}
+                self._entries[key] = entry
+            counter = entry["next"]
+            # Guard against outside writes the mtime didn't reveal (coarse timestamps)
+            while any(os.path.exists(os.path.join(folder, f"{prefix}_{counter + i:05d}{ext}")) for i in range(count) for ext in extensions):
+                counter += 1
+            entry["next"] = counter + count
+            return counter
+
+    def note_write(self, folder):
+        """Records the folder mtime after one of our own writes so it doesn't trigger a rescan."""
+        folder_key = os.path.normcase(os.path.abspath(folder))
+        with self._lock:
+            try:
+                mtime_ns = os.stat(folder).st_mtime_ns
+            except OSError:
+                return
+            for (entry_folder, _), entry in self._entries.items():
+                if entry_folder == folder_key:
+                    entry["mtime_ns"] = mtime_ns
+
+
+OUTPUT_COUNTERS = OutputCounterIndex()
+
+
+def _write_atomically(filepath, write_fn):
+    """
+    Calls write_fn(temp_path) for a temporary file next to filepath and renames it
+    into place, so a partially written file is never visible under the final name.
+    """
+    directory, filename = os.path.split(filepath)
+    temp_path = os.path.join(directory, f".{filename}.{uuid.uuid4().hex[:8]}.tmp")
+    try:
+        write_fn(temp_path)
+        if not os.path.exists(temp_path):
+            raise RuntimeError("Encoder completed but wrote no file (check permissions, disk space and the audio backend)")
+        os.replace(temp_path, filepath)
+        OUTPUT_COUNTERS.note_write(directory)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    return filepath
+
+
+def _encode_to_file(filepath, waveform, sample_rate, format, save_kwargs):
+    """Encodes a prepared [C, T] waveform with torchaudio."""
+    return _write_atomically(filepath, lambda temp_path: torchaudio.save(temp_path, waveform, sample_rate, format=format, **save_kwargs))
+
+
+# --- Resampling / Loudness ---
+@functools.lru_cache(maxsize=8)
+def get_resampler(orig_sample_rate, new_sample_rate):
+    """Resample transform per (orig, new) rate; the sinc kernel is computed once on construction."""
+    return torchaudio.transforms.Resample(orig_sample_rate, new_sample_rate)
+
+
+# --- Streaming Encode ---
+# soundfile subtypes per WAV encoding; FLAC is written as 24 bit (16 bit for int16 input)
+_SOUNDFILE_WAV_SUBTYPES = {"PCM_16": "PCM_16", "PCM_24": "PCM_24", "PCM_32": "PCM_32", "FLOAT_32": "FLOAT", "FLOAT_64": "DOUBLE"}
+_WAVE_SAMPLE_WIDTHS = {"PCM_16": 2, "PCM_24": 3, "PCM_32": 4}
+
+
+def can_stream(format, wav_encoding):
+    """Whether the chunked writer supports this format/encoding with the installed libraries."""
+    if is_available("soundfile"):
+        return format in ("wav", "flac")
+    return format == "wav" and wav_encoding in _WAVE_SAMPLE_WIDTHS
+
+
+def _chunk_as_float(chunk):
+    """Clamped float chunk in [-1, 1]; integer chunks are scaled to float first (both encoders take float)."""
+    if not torch.is_floating_point(chunk):
+        chunk = _int_to_float(chunk)
+    return torch.clamp(chunk, -1.0, 1.0)
+
+
+def _float_chunk_to_pcm_bytes(chunk, sample_width):
+    """Interleaved little-endian PCM bytes for a clamped float [C, T] chunk."""
+    bits = sample_width * 8
+    scale = 2 ** (bits - 1)
+    samples = np.ascontiguousarray(torch.clamp(torch.round(chunk.double() * scale), -scale, scale - 1).T.numpy(), dtype='<i4')
+    if sample_width == 2:
+        return samples.astype('<i2').tobytes()
+    if sample_width == 3:
+        return samples.view(np.uint8).reshape(-1, 4)[:, :3].tobytes()
+    return samples.tobytes()
+
+
+def _stream_encode_to_file(filepath, waveform, sample_rate, format, wav_encoding, flac_compression, chunk_frames):
+    """
+    Converts and encodes a [C, T] waveform chunk_frames samples at a time straight
+    into the output file, so peak extra memory is one converted chunk instead of
+    several full-length copies. Debug-level stats are accumulated per chunk.
+    """
+    channels, total_frames = waveform.shape
+    debug = log_enabled("debug") # Per-chunk stats cost three reductions; only gather them for debug logs
+    stats = {"min": float("inf"), "max": float("-inf"), "sum": 0.0}
+
+    def chunks():
+        for start in range(0, total_frames, chunk_frames):
+            chunk = _chunk_as_float(waveform[:, start:start + chunk_frames])
+            if debug:
+                stats["min"] = min(stats["min"], chunk.min().item())
+                stats["max"] = max(stats["max"], chunk.max().item())
+                stats["sum"] += chunk.double().sum().item()
+            yield chunk
+
+    def write_soundfile(temp_path):
+        if format == "wav":
+            subtype = _SOUNDFILE_WAV_SUBTYPES.get(wav_encoding, "PCM_16")
+            extra = {}
+        else:
+            subtype = "PCM_16" if waveform.dtype == torch.int16 else "PCM_24"
+            extra = {"compression_level": flac_compression / 8.0} # soundfile >= 0.12
+        try:
+            out = soundfile.SoundFile(temp_path, "w", samplerate=sample_rate, channels=channels, subtype=subtype, format=format.upper(), **extra)
+        except TypeError:
+            out = soundfile.SoundFile(temp_path, "w", samplerate=sample_rate, channels=channels, subtype=subtype, format=format.upper())
+        with out:
+            for chunk in chunks():
+                out.write(chunk.T.numpy())
+
+    def write_wave(temp_path):
+        sample_width = _WAVE_SAMPLE_WIDTHS[wav_encoding]
+        with wave.open(temp_path, "wb") as out:
+            out.setnchannels(channels)
+            out.setsampwidth(sample_width)
+            out.setframerate(sample_rate)
+            for chunk in chunks():
+                out.writeframes(_float_chunk_to_pcm_bytes(chunk, sample_width))
+
+    _write_atomically(filepath, write_soundfile if is_available("soundfile") else write_wave)
+    if debug:
+        print(f"[SaveAudioAdvanced] Streamed {total_frames} frames in {-(-total_frames // chunk_frames)} chunk(s) to {filepath} "
+              f"(min={stats['min']:.4f}, max={stats['max']:.4f}, mean={stats['sum'] / waveform.numel():.4f})")
+    return filepath
+
 
 class SaveAudioAdvanced:
     """
     Saves audio data to a specified format (FLAC, WAV, MP3).
     Handles multiple common AUDIO formats and uses correct backend options.
     Includes detailed logging for debugging.
+    Batched [B, C, T] waveforms are saved as one file per item, encoded in parallel.
+    Optionally encodes in the background so the next prompt doesn't wait for the encoder.
     """
     def __init__(self):
         self.output_dir = folder_paths.get_output_directory()
@@ -24,12 +298,19 @@ class SaveAudioAdvanced:
             "required": {
                 "audio": ("AUDIO", ),
                 "filename_prefix": ("STRING", {"default": "ComfyUI"}),
-                "format": (["flac", "wav", "mp3"], {"default": "flac"}),
+                "format": (AUDIO_FORMATS, {"default": "flac"}),
             },
             "optional": {
                 "wav_encoding": (["PCM_16", "PCM_24", "PCM_32", "FLOAT_32", "FLOAT_64"], {"default": "PCM_16"}),
                 "flac_compression": ("INT", {"default": 5, "min": 0, "max": 8, "step": 1}), # Level 0-8
                 "mp3_bitrate": ("INT", {"default": 192, "min": 8, "max": 320, "step": 8}), # Bitrate in kbps (currently unused for save)
+                "async_save": ("BOOLEAN", {"default": False, "tooltip": "Encode in a background worker and return immediately; the file appears once encoding finishes"}),
+                "flush_pending": ("BOOLEAN", {"default": False, "tooltip": "Wait for all queued background saves (including this one) before finishing"}),
+                "additional_formats": ("STRING", {"default": "", "tooltip": "Comma separated extra formats (e.g. 'mp3, wav') encoded from the same prepared waveform under the same counter"}),
+                "target_sample_rate": ("INT", {"default": 0, "min": 0, "max": 384000, "step": 1, "tooltip": "Resample before saving, 0 keeps the input rate"}),
+                "normalize_loudness": ("BOOLEAN", {"default": False, "tooltip": "Apply a gain so each item's integrated loudness (ITU-R BS.1770) matches target_lufs"}),
+                "target_lufs": ("FLOAT", {"default": -14.0, "min": -70.0, "max": 0.0, "step": 0.5}),
+                "stream_chunk_seconds": ("FLOAT", {"default": 0.0, "min": 0.0, "max": 3600.0, "step": 1.0, "tooltip": "WAV/FLAC: convert and write in chunks of this many seconds to keep memory flat for very long audio, 0 disables"}),
             },
              "hidden": {
                 "prompt": "PROMPT",
@@ -42,181 +323,286 @@ class SaveAudioAdvanced:
     OUTPUT_NODE = True
     CATEGORY = "BETA/Audio"
 
-    def save_audio(self, audio, filename_prefix, format,
-                   wav_encoding="PCM_16", flac_compression=5, mp3_bitrate=192,
-                   prompt=None, extra_pnginfo=None):
-
-        print("[SaveAudioAdvanced] Node execution started.")
-
+    def _parse_audio_input(self, audio):
+        """Returns (waveform, sample_rate) from the supported AUDIO styles, or (None, None)."""
         # --- DEBUG PRINT for Input ---
-        print(f"[SaveAudioAdvanced] DEBUG: Received 'audio' type: {type(audio)}")
-        if isinstance(audio, (list, tuple)):
-             print(f"[SaveAudioAdvanced] DEBUG: Is list/tuple. Length: {len(audio)}")
-             if len(audio) > 0: print(f"[SaveAudioAdvanced] DEBUG: First element type: {type(audio[0])}")
-        elif isinstance(audio, dict):
-             print(f"[SaveAudioAdvanced] DEBUG: Is dict. Keys: {list(audio.keys())}")
-             print(f"[SaveAudioAdvanced] DEBUG: Dict value types: waveform={type(audio.get('waveform'))}, sample_rate={type(audio.get('sample_rate'))}")
-        try:
-             if isinstance(audio, dict) and isinstance(audio.get('waveform'), (torch.Tensor, np.ndarray)): print(f"[SaveAudioAdvanced] DEBUG: Waveform shape (if tensor/ndarray): {audio['waveform'].shape}")
-             elif isinstance(audio, (list,tuple)) and len(audio) > 0 and isinstance(audio[0], dict) and isinstance(audio[0].get('waveform'), (torch.Tensor, np.ndarray)): print(f"[SaveAudioAdvanced] DEBUG: Waveform shape (if tensor/ndarray in wrapped dict): {audio[0]['waveform'].shape}")
-             elif isinstance(audio, (list,tuple)) and len(audio) > 0 and isinstance(audio[0], (torch.Tensor, np.ndarray)): print(f"[SaveAudioAdvanced] DEBUG: Waveform shape (if tensor/ndarray in tuple): {audio[0].shape}")
-             else: print(f"[SaveAudioAdvanced] DEBUG: Received 'audio' content (partial str): {str(audio)[:500]}")
-        except Exception as e: print(f"[SaveAudioAdvanced] DEBUG: Could not print detailed audio content/shape: {e}")
+        if log_enabled("debug"):
+            print(f"[SaveAudioAdvanced] DEBUG: Received 'audio' type: {type(audio)}")
+            if isinstance(audio, (list, tuple)):
+                 print(f"[SaveAudioAdvanced] DEBUG: Is list/tuple. Length: {len(audio)}")
+                 if len(audio) > 0: print(f"[SaveAudioAdvanced] DEBUG: First element type: {type(audio[0])}")
+            elif isinstance(audio, dict):
+                 print(f"[SaveAudioAdvanced] DEBUG: Is dict. Keys: {list(audio.keys())}")
+                 print(f"[SaveAudioAdvanced] DEBUG: Dict value types: waveform={type(audio.get('waveform'))}, sample_rate={type(audio.get('sample_rate'))}")
+            try:
+                 if isinstance(audio, dict) and isinstance(audio.get('waveform'), (torch.Tensor, np.ndarray)): print(f"[SaveAudioAdvanced] DEBUG: Waveform shape (if tensor/ndarray): {audio['waveform'].shape}")
+                 elif isinstance(audio, (list,tuple)) and len(audio) > 0 and isinstance(audio[0], dict) and isinstance(audio[0].get('waveform'), (torch.Tensor, np.ndarray)): print(f"[SaveAudioAdvanced] DEBUG: Waveform shape (if tensor/ndarray in wrapped dict): {audio[0]['waveform'].shape}")
+                 elif isinstance(audio, (list,tuple)) and len(audio) > 0 and isinstance(audio[0], (torch.Tensor, np.ndarray)): print(f"[SaveAudioAdvanced] DEBUG: Waveform shape (if tensor/ndarray in tuple): {audio[0].shape}")
+                 else: print(f"[SaveAudioAdvanced] DEBUG: Received 'audio' content (partial str): {str(audio)[:500]}")
+            except Exception as e: print(f"[SaveAudioAdvanced] DEBUG: Could not print detailed audio content/shape: {e}")
         # --- END DEBUG PRINT ---
 
-
         # --- Input Validation Section ---
-        waveform_input = None; sample_rate_input = None; valid_input_format = False
-        input_type_str = str(type(audio)) # Keep this for error logging later
         # Style 1: Standard tuple (Tensor, int)
         if isinstance(audio, (tuple, list)) and len(audio) == 2 and isinstance(audio[0], (torch.Tensor, np.ndarray)) and isinstance(audio[1], int):
-            waveform_input = audio[0]; sample_rate_input = audio[1]; valid_input_format = True; print("[SaveAudioAdvanced] Info: Detected standard AUDIO tuple format (Tensor, int).")
+            log("info", "[SaveAudioAdvanced] Info: Detected standard AUDIO tuple format (Tensor, int).")
+            return audio[0], audio[1]
         # Style 2: Wrapped dictionary tuple ( {'waveform':..., 'sample_rate':...}, )
         elif isinstance(audio, (tuple, list)) and len(audio) == 1 and isinstance(audio[0], dict):
             audio_dict = audio[0]
             if 'waveform' in audio_dict and 'sample_rate' in audio_dict and isinstance(audio_dict.get('waveform'), (torch.Tensor, np.ndarray)) and isinstance(audio_dict.get('sample_rate'), int):
-                waveform_input = audio_dict['waveform']; sample_rate_input = audio_dict['sample_rate']; valid_input_format = True; print("[SaveAudioAdvanced] Info: Detected wrapped dictionary AUDIO format ({'waveform':..., 'sample_rate':...}, ).")
+                log("info", "[SaveAudioAdvanced] Info: Detected wrapped dictionary AUDIO format ({'waveform':..., 'sample_rate':...}, ).")
+                return audio_dict['waveform'], audio_dict['sample_rate']
         # Style 3: Plain dictionary { 'waveform':..., 'sample_rate':... }
         elif isinstance(audio, dict):
             if 'waveform' in audio and 'sample_rate' in audio and isinstance(audio.get('waveform'), (torch.Tensor, np.ndarray)) and isinstance(audio.get('sample_rate'), int):
-                waveform_input = audio['waveform']; sample_rate_input = audio['sample_rate']; valid_input_format = True; print("[SaveAudioAdvanced] Info: Detected plain dictionary AUDIO format {'waveform':..., 'sample_rate':...}.")
+                log("info", "[SaveAudioAdvanced] Info: Detected plain dictionary AUDIO format {'waveform':..., 'sample_rate':...}.")
+                return audio['waveform'], audio['sample_rate']
 
         # Handle invalid formats
-        if not valid_input_format:
-             print("[SaveAudioAdvanced] Input format validation failed.")
-             error_msg = f"[SaveAudioAdvanced] Error: Input 'audio' is not a recognized AUDIO format." # ... (rest of the detailed error message using input_type_str etc.)
-             error_msg += f"\n   DEBUG INFO: Type={type(audio)}" # Add debug info
-             if isinstance(audio, (list, tuple)): error_msg += f", Len={len(audio)}"
-             if isinstance(audio, dict): error_msg += f", Keys={list(audio.keys())}"
-             print(error_msg)
-             return {} # Exit point
-
-        print(f"[SaveAudioAdvanced] Input format validated successfully. Sample Rate: {sample_rate_input}")
-
+        log("error", "[SaveAudioAdvanced] Input format validation failed.")
+        error_msg = f"[SaveAudioAdvanced] Error: Input 'audio' is not a recognized AUDIO format."
+        error_msg += f"\n   DEBUG INFO: Type={type(audio)}" # Add debug info
+        if isinstance(audio, (list, tuple)): error_msg += f", Len={len(audio)}"
+        if isinstance(audio, dict): error_msg += f", Keys={list(audio.keys())}"
+        log("error", error_msg)
+        return None, None
 
+    def _prepare_waveform(self, waveform_input):
+        """Converts to a [B, C, T] CPU tensor, or returns None with the error logged."""
         # --- Tensor Conversion & Prep ---
-        sample_rate = sample_rate_input
         if isinstance(waveform_input, np.ndarray):
             try: waveform = torch.from_numpy(waveform_input)
-            except Exception as e: print(f"[SaveAudioAdvanced] Error: numpy conversion failed: {e}"); return {}
+            except Exception as e: log("error", f"[SaveAudioAdvanced] Error: numpy conversion failed: {e}"); return None
         elif isinstance(waveform_input, torch.Tensor): waveform = waveform_input
-        else: print(f"[SaveAudioAdvanced] Error: Internal validation error."); return {}
-        print(f"[SaveAudioAdvanced] Waveform is now a tensor. Initial dtype: {waveform.dtype}")
-
-        if waveform.numel() == 0: print("[SaveAudioAdvanced] Error: Input waveform tensor is empty."); return {}
-        if waveform.device != torch.device('cpu'): print("[SaveAudioAdvanced] Moving waveform to CPU."); waveform = waveform.cpu()
+        else: log("error", f"[SaveAudioAdvanced] Error: Internal validation error."); return None
+        if log_enabled("debug"): print(f"[SaveAudioAdvanced] Waveform is now a tensor. Initial dtype: {waveform.dtype}")
 
+        if waveform.numel() == 0: log("error", "[SaveAudioAdvanced] Error: Input waveform tensor is empty."); return None
+        if waveform.device != torch.device('cpu'): log("info", "[SaveAudioAdvanced] Moving waveform to CPU."); waveform = waveform.cpu()
 
         # --- Shape Handling ---
-        print(f"[SaveAudioAdvanced] Waveform shape before final processing: {waveform.shape}")
-        if waveform.ndim >= 3 and waveform.shape[0] == 1: waveform = waveform.squeeze(0)
+        if log_enabled("debug"): print(f"[SaveAudioAdvanced] Waveform shape before final processing: {waveform.shape}")
         if waveform.ndim == 1: waveform = waveform.unsqueeze(0)
-        elif waveform.ndim != 2: print(f"[SaveAudioAdvanced] Error: Cannot handle waveform shape {waveform.shape}"); return {}
-        print(f"[SaveAudioAdvanced] Waveform shape for saving: {waveform.shape}")
+        if waveform.ndim == 2: waveform = waveform.unsqueeze(0) # Single [C, T] item
+        elif waveform.ndim != 3: log("error", f"[SaveAudioAdvanced] Error: Cannot handle waveform shape {waveform.shape}"); return None
+        if log_enabled("debug"): print(f"[SaveAudioAdvanced] Waveform shape for saving: {waveform.shape} ({waveform.shape[0]} item(s))")
+        return waveform
 
+    def _process_waveform(self, waveform, sample_rate, target_sample_rate, normalize_loudness, target_lufs):
+        """
+        Optional resample + loudness normalization of a [B, C, T] batch.
+        Returns (waveform, sample_rate, owned); 'owned' means the result is a private
+        copy that later stages may modify in place (at most one copy is made).
+        """
+        owned = False
+        if target_sample_rate > 0 and target_sample_rate != sample_rate:
+            if not torch.is_floating_point(waveform): waveform = _int_to_float(waveform)
+            log("info", f"[SaveAudioAdvanced] Resampling {sample_rate} Hz -> {target_sample_rate} Hz.")
+            with torch.no_grad():
+                waveform = get_resampler(sample_rate, target_sample_rate)(waveform.float())
+            sample_rate = target_sample_rate
+            owned = True
 
-        # --- File Naming ---
-        try:
-            full_output_folder, filename, counter, subfolder, filename_prefix_out = \
-                folder_paths.get_save_image_path(filename_prefix, self.output_dir)
-            file_extension = f".{format.lower()}"
-            filename_with_counter = f"{filename_prefix_out}_{counter:05d}{file_extension}"
-            filepath = os.path.join(full_output_folder, filename_with_counter)
-            print(f"[SaveAudioAdvanced] Calculated save path: {filepath}")
-        except Exception as e: print(f"[SaveAudioAdvanced] Error calculating output path: {e}"); import traceback; print(traceback.format_exc()); return {}
+        if normalize_loudness:
+            if not owned:
+                waveform = _int_to_float(waveform) if not torch.is_floating_point(waveform) else waveform.clone()
+                owned = True
+            with torch.no_grad():
+                measured = torchaudio.functional.loudness(waveform, sample_rate) # LUFS per batch item
+            gains = torch.pow(10.0, (target_lufs - measured) / 20.0)
+            # Silence or clips shorter than the 400ms gating block have no finite loudness
+            finite = torch.isfinite(gains)
+            if not finite.all():
+                log("warning", f"[SaveAudioAdvanced] Warning: Loudness undefined for {int((~finite).sum())} item(s) (silent or shorter than 0.4 s), leaving them unchanged.")
+                gains = torch.where(finite, gains, torch.ones_like(gains))
+            waveform.mul_(gains.to(waveform.dtype).view(-1, 1, 1))
+            log("info", f"[SaveAudioAdvanced] Loudness normalized to {target_lufs:.1f} LUFS (measured: {', '.join(f'{v:.1f}' for v in measured.tolist())}).")
 
+        return waveform, sample_rate, owned
 
-        # --- Format Specific Parameters & Data Prep ---
+    def _resolve_output_path(self, filename_prefix):
+        """(full_output_folder, filename, subfolder) for a prefix like ComfyUI's get_save_image_path, without its directory scan."""
+        if "%" in filename_prefix:
+            filename_prefix = _compute_filename_vars(filename_prefix)
+        subfolder = os.path.dirname(os.path.normpath(filename_prefix))
+        filename = os.path.basename(os.path.normpath(filename_prefix))
+        full_output_folder = os.path.join(self.output_dir, subfolder)
+        if os.path.commonpath((os.path.abspath(self.output_dir), os.path.abspath(full_output_folder))) != os.path.abspath(self.output_dir):
+            raise ValueError(f"Saving outside the output folder is not allowed (filename_prefix: {filename_prefix})")
+        return full_output_folder, filename, subfolder
+
+    def _parse_formats(self, format, additional_formats):
+        """The main format followed by the valid, distinct entries of the comma separated list."""
+        formats = [format]
+        for extra in additional_formats.split(","):
+            extra = extra.strip().lower().lstrip(".")
+            if not extra or extra in formats:
+                continue
+            if extra not in AUDIO_FORMATS:
+                log("warning", f"[SaveAudioAdvanced] Warning: Ignoring unknown additional format '{extra}' (supported: {', '.join(AUDIO_FORMATS)}).")
+                continue
+            formats.append(extra)
+        return formats
+
+    def _convert_for_format(self, waveform, format, wav_encoding, flac_compression, inplace=False):
+        """
+        Returns (waveform, save_kwargs) with the dtype/range the encoder for 'format' expects.
+        With inplace=True the waveform is a private copy and is clamped in place.
+        """
         save_kwargs = {} # Reset kwargs for each run
+        clamp = (lambda w: w.clamp_(-1.0, 1.0)) if inplace else (lambda w: torch.clamp(w, -1.0, 1.0))
         # --- WAV ---
         if format == 'wav':
             encoding_map = { "PCM_16": {"encoding": "PCM_S", "bits_per_sample": 16}, "PCM_24": {"encoding": "PCM_S", "bits_per_sample": 24}, "PCM_32": {"encoding": "PCM_S", "bits_per_sample": 32}, "FLOAT_32": {"encoding": "PCM_F", "bits_per_sample": 32}, "FLOAT_64": {"encoding": "PCM_F", "bits_per_sample": 64}, }
             wav_params = encoding_map.get(wav_encoding, encoding_map["PCM_16"])
-            if wav_encoding not in encoding_map: print(f"[SaveAudioAdvanced] Warning: Unknown WAV encoding '{wav_encoding}'. Using default PCM_16.")
+            if wav_encoding not in encoding_map: log("warning", f"[SaveAudioAdvanced] Warning: Unknown WAV encoding '{wav_encoding}'. Using default PCM_16.")
             save_kwargs.update(wav_params)
             # WAV data prep
             target_encoding = wav_params['encoding']; bits_per_sample = wav_params['bits_per_sample']
             target_dtype = getattr(torch, f"int{bits_per_sample}", torch.int16) if target_encoding == "PCM_S" else getattr(torch, f"float{bits_per_sample}", torch.float32)
-            if target_encoding == "PCM_S" and torch.is_floating_point(waveform): waveform = torch.clamp(waveform, -1.0, 1.0)
+            if target_encoding == "PCM_S" and torch.is_floating_point(waveform): waveform = clamp(waveform)
             elif target_encoding == "PCM_F":
-                if not torch.is_floating_point(waveform):
-                     try:
-                         dtype_info = torch.iinfo(waveform.dtype); max_val = dtype_info.max; min_val = dtype_info.min
-                         if min_val < 0: waveform = waveform.float() / max(abs(max_val), abs(min_val))
-                         else: waveform = (waveform.float() / max_val) * 2.0 - 1.0
-                     except TypeError: waveform = waveform.float()
-                waveform = torch.clamp(waveform, -1.0, 1.0)
+                if not torch.is_floating_point(waveform): waveform = _int_to_float(waveform)
+                waveform = clamp(waveform)
                 if waveform.dtype != target_dtype: waveform = waveform.to(target_dtype)
         # --- FLAC ---
         elif format == 'flac':
             save_kwargs['compression_level'] = flac_compression
-            if torch.is_floating_point(waveform): waveform = torch.clamp(waveform, -1.0, 1.0)
+            if torch.is_floating_point(waveform): waveform = clamp(waveform)
         # --- MP3 ---
         elif format == 'mp3':
-            print("[SaveAudioAdvanced] Info: Passing no specific kwargs for MP3 format, using backend defaults.")
+            log("info", "[SaveAudioAdvanced] Info: Passing no specific kwargs for MP3 format, using backend defaults.")
             # Ensure no kwargs added: save_kwargs should remain empty here
             # MP3 Data prep
             if not torch.is_floating_point(waveform):
-                 print("[SaveAudioAdvanced] Warning: Input waveform is not float for MP3 save. Normalizing.")
-                 try:
-                     dtype_info = torch.iinfo(waveform.dtype); max_val = dtype_info.max; min_val = dtype_info.min
-                     if min_val < 0: waveform = waveform.float() / max(abs(max_val), abs(min_val))
-                     else: waveform = (waveform.float() / max_val) * 2.0 - 1.0
-                 except TypeError: waveform = waveform.float() # Fallback
-            waveform = torch.clamp(waveform, -1.0, 1.0)
+                 log("warning", "[SaveAudioAdvanced] Warning: Input waveform is not float for MP3 save. Normalizing.")
+                 waveform = _int_to_float(waveform)
+            waveform = clamp(waveform)
             if waveform.dtype != torch.float32: waveform = waveform.to(torch.float32)
 
-        print(f"[SaveAudioAdvanced] Waveform final dtype for saving: {waveform.dtype}")
-        if torch.is_floating_point(waveform): print(f"[SaveAudioAdvanced] Waveform stats (float): min={waveform.min():.4f}, max={waveform.max():.4f}, mean={waveform.mean():.4f}")
-        else: print(f"[SaveAudioAdvanced] Waveform stats (int): min={waveform.min()}, max={waveform.max()}, mean={waveform.float().mean():.4f}")
+        if log_enabled("debug"): # Full-tensor reductions, skipped unless debugging
+            print(f"[SaveAudioAdvanced] Waveform final dtype for saving: {waveform.dtype}")
+            if torch.is_floating_point(waveform): print(f"[SaveAudioAdvanced] Waveform stats (float): min={waveform.min():.4f}, max={waveform.max():.4f}, mean={waveform.mean():.4f}")
+            else: print(f"[SaveAudioAdvanced] Waveform stats (int): min={waveform.min()}, max={waveform.max()}, mean={waveform.float().mean():.4f}")
+        return waveform, save_kwargs
+
+    def _encode_jobs(self, jobs):
+        """
+        Encodes (filepath, encode_fn, item, encode_args) jobs in parallel (inline for a
+        single job), returns the paths that were written (in job order).
+        """
+        def run(job):
+            filepath, encode_fn, item, encode_args = job
+            try:
+                encode_fn(filepath, item, *encode_args)
+                return filepath
+            except Exception as e:
+                log("error", f"[SaveAudioAdvanced] Error saving {filepath}: {e}")
+                # Specific hints can remain if useful
+                if filepath.endswith('.mp3') and ('backend' in str(e).lower() or 'ab' in str(e).lower()):
+                     log("error", "[SaveAudioAdvanced] MP3 saving hint: Check FFmpeg/LAME installation and PATH.")
+                log("error", traceback.format_exc())
+                return None
+
+        if len(jobs) == 1:
+            results = [run(jobs[0])]
+        else:
+            with ThreadPoolExecutor(max_workers=min(BATCH_SAVE_WORKERS, len(jobs)), thread_name_prefix="beta-audio-batch") as executor:
+                results = list(executor.map(run, jobs))
+        saved_paths = [filepath for filepath in results if filepath is not None]
+        log("info", f"[SaveAudioAdvanced] Saved {len(saved_paths)}/{len(jobs)} file(s).")
+        return saved_paths
+
+    def save_audio(self, audio, filename_prefix, format,
+                   wav_encoding="PCM_16", flac_compression=5, mp3_bitrate=192,
+                   async_save=False, flush_pending=False, additional_formats="",
+                   target_sample_rate=0, normalize_loudness=False, target_lufs=-14.0,
+                   stream_chunk_seconds=0.0,
+                   prompt=None, extra_pnginfo=None):
 
+        log("info", "[SaveAudioAdvanced] Node execution started.")
 
-        # --- Saving ---
-        saved = False
+        waveform_input, sample_rate = self._parse_audio_input(audio)
+        if waveform_input is None:
+            return {} # Exit point
+        log("info", f"[SaveAudioAdvanced] Input format validated successfully. Sample Rate: {sample_rate}")
+
+        unprocessed = self._prepare_waveform(waveform_input)
+        if unprocessed is None:
+            return {}
+
+        # --- Resample / Loudness ---
         try:
-            print("[SaveAudioAdvanced] Ensuring output directory exists...")
+            waveform, sample_rate, owned = self._process_waveform(unprocessed, sample_rate, target_sample_rate, normalize_loudness, target_lufs)
+        except Exception as e: log("error", f"[SaveAudioAdvanced] Error during resampling/loudness normalization: {e}"); log("error", traceback.format_exc()); return {}
+
+        batch_size = waveform.shape[0]
+        formats = self._parse_formats(format, additional_formats)
+
+        # --- File Naming ---
+        # Counters for all batch items are reserved up front: counter .. counter + batch_size - 1,
+        # shared by all formats so e.g. name_00001.flac and name_00001.mp3 pair up
+        try:
+            full_output_folder, filename, subfolder = self._resolve_output_path(filename_prefix)
+            counter = OUTPUT_COUNTERS.reserve(full_output_folder, filename, batch_size, [f".{fmt}" for fmt in formats])
+            base_paths = [os.path.join(full_output_folder, f"{filename}_{counter + i:05d}") for i in range(batch_size)]
+            log("info", f"[SaveAudioAdvanced] Calculated save path(s): {base_paths[0]}.{'/'.join(formats)}" + (f" .. {os.path.basename(base_paths[-1])}" if batch_size > 1 else ""))
+        except Exception as e: log("error", f"[SaveAudioAdvanced] Error calculating output path: {e}"); log("error", traceback.format_exc()); return {}
+
+        try:
+            log("info", "[SaveAudioAdvanced] Ensuring output directory exists...")
             os.makedirs(full_output_folder, exist_ok=True)
-            print(f"[SaveAudioAdvanced] Attempting to save with torchaudio...")
-            print(f"[SaveAudioAdvanced]   - Path: {filepath}")
-            print(f"[SaveAudioAdvanced]   - Format: {format}")
-            print(f"[SaveAudioAdvanced]   - SR: {sample_rate}")
-            print(f"[SaveAudioAdvanced]   - Shape: {waveform.shape}")
-            print(f"[SaveAudioAdvanced]   - Dtype: {waveform.dtype}")
-            print(f"[SaveAudioAdvanced]   - Kwargs: {save_kwargs}") # Should be empty for MP3
-
-            # Call torchaudio.save, passing the potentially empty save_kwargs
-            torchaudio.save(filepath, waveform, sample_rate, format=format, **save_kwargs)
-
-            print("[SaveAudioAdvanced] torchaudio.save() completed without raising an exception.")
-
-            if os.path.exists(filepath):
-                 print(f"[SaveAudioAdvanced] File check: Confirmed file exists at {filepath}")
-                 saved = True
+
+            jobs = []
+            for fmt in formats:
+                # --- Format Specific Parameters & Data Prep ---
+                streaming = stream_chunk_seconds > 0 and can_stream(fmt, wav_encoding)
+                if stream_chunk_seconds > 0 and not streaming:
+                    log("info", f"[SaveAudioAdvanced] Info: Streaming is not available for {fmt}/{wav_encoding} (install 'soundfile' for FLAC and float WAV). Using the regular path.")
+                if streaming:
+                    # Conversion happens per chunk inside the writer
+                    prepared, save_kwargs = waveform, {}
+                    chunk_frames = max(1, int(stream_chunk_seconds * sample_rate))
+                    encode_fn, encode_args = _stream_encode_to_file, (sample_rate, fmt, wav_encoding, flac_compression, chunk_frames)
+                else:
+                    prepared, save_kwargs = self._convert_for_format(waveform, fmt, wav_encoding, flac_compression, inplace=owned)
+                    encode_fn, encode_args = _encode_to_file, (sample_rate, fmt, save_kwargs)
+
+                if log_enabled("debug"):
+                    print(f"[SaveAudioAdvanced] Prepared {fmt} with {'chunked writer (' + ('soundfile' if is_available('soundfile') else 'wave') + ')' if streaming else 'torchaudio'}:")
+                    print(f"[SaveAudioAdvanced]   - SR: {sample_rate}")
+                    print(f"[SaveAudioAdvanced]   - Shape: {prepared.shape}")
+                    print(f"[SaveAudioAdvanced]   - Dtype: {prepared.dtype}")
+                    print(f"[SaveAudioAdvanced]   - Kwargs: {save_kwargs}") # Should be empty for MP3
+
+                if async_save and (prepared.data_ptr() == unprocessed.data_ptr() or not prepared.is_contiguous()):
+                    # Snapshot: the worker must not see later in-place changes to the upstream tensor
+                    prepared = prepared.contiguous().clone()
+                jobs.extend((f"{base_path}.{fmt}", encode_fn, item, encode_args) for base_path, item in zip(base_paths, prepared))
+
+            # --- Saving ---
+            if async_save:
+                for filepath, encode_fn, item, encode_args in jobs:
+                    submit_save(encode_fn, filepath, item, *encode_args)
+                log("info", f"[SaveAudioAdvanced] Queued {len(jobs)} file(s) for background encoding.")
+                saved_paths = [job[0] for job in jobs]
             else:
-                 print(f"[SaveAudioAdvanced] File check WARNING: torchaudio.save() completed BUT file does not exist at {filepath}!")
-                 print("[SaveAudioAdvanced]   - Check filesystem permissions and available disk space.")
-                 print("[SaveAudioAdvanced]   - Check if torchaudio backend (e.g., FFmpeg) wrote to a temporary location or failed silently.")
+                saved_paths = self._encode_jobs(jobs)
+                if not saved_paths:
+                    return {}
 
         except Exception as e:
-            print(f"[SaveAudioAdvanced] Error DURING saving audio file: {e}")
-            # Specific hints can remain if useful
-            if format == 'mp3' and ('backend' in str(e).lower() or 'ab' in str(e).lower()):
-                 print("[SaveAudioAdvanced] MP3 saving hint: Check FFmpeg/LAME installation and PATH.")
-            import traceback
-            print(traceback.format_exc())
-            # ************************************
-            # ***** THE IMPORTANT ADDITION *****
-            return {} # <--- Make sure this line is present inside the except block
-            # ************************************
+            log("error", f"[SaveAudioAdvanced] Error DURING saving audio file: {e}")
+            log("error", traceback.format_exc())
+            return {}
+
+        if flush_pending:
+            flush_pending_saves()
 
         # --- Result for UI ---
-        if saved:
-            print(f"[SaveAudioAdvanced] Operation successful. Reporting saved file to UI.")
-            result_filename = os.path.basename(filepath)
-            results = [{"filename": result_filename, "subfolder": subfolder, "type": self.type}]
-            return {"ui": {"audio": results}}
-        else:
-            print("[SaveAudioAdvanced] Operation finished, but file was not confirmed saved.")
-            return {} # Also signals failure
+        log("info", f"[SaveAudioAdvanced] Operation successful. Reporting {len(saved_paths)} saved file(s) to UI.")
+        results = [{"filename": os.path.basename(filepath), "subfolder": subfolder, "type": self.type} for filepath in saved_paths]
+        return {"ui": {"audio": results}}
 
 # EOF
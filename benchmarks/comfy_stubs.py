@@ -0,0 +1,76 @@
+"""
+Minimal stand-ins for the ComfyUI modules the node package imports (folder_paths,
+server), so the nodes can be loaded and run outside of a ComfyUI installation.
+Only what the package touches at import and execution time is provided.
+"""
+import importlib.util
+import os
+import sys
+import types
+
+
+class _Routes:
+    """Accepts route registrations (routes.get/post decorators) and keeps the handlers."""
+    def __init__(self):
+        self.handlers = {}
+
+    def _register(self, method, path):
+        def decorator(handler):
+            self.handlers[(method, path)] = handler
+            return handler
+        return decorator
+
+    def get(self, path):
+        return self._register("GET", path)
+
+    def post(self, path):
+        return self._register("POST", path)
+
+
+def _make_folder_paths(output_dir):
+    folder_paths = types.ModuleType("folder_paths")
+    folder_paths.supported_pt_extensions = {".ckpt", ".pt", ".bin", ".pth", ".safetensors"}
+    folder_paths.get_output_directory = lambda: output_dir
+    folder_paths.get_temp_directory = lambda: os.path.join(output_dir, "temp")
+    folder_paths.get_filename_list = lambda folder_name: []
+    folder_paths.get_folder_paths = lambda folder_name: []
+    folder_paths.get_full_path = lambda folder_name, filename: None
+
+    def get_save_image_path(filename_prefix, output_dir, image_width=0, image_height=0):
+        # Same return shape as ComfyUI: (full_output_folder, filename, counter, subfolder, filename_prefix)
+        subfolder, filename = os.path.split(os.path.normpath(filename_prefix))
+        full_output_folder = os.path.join(output_dir, subfolder)
+        os.makedirs(full_output_folder, exist_ok=True)
+        return full_output_folder, filename, 1, subfolder, filename_prefix
+
+    folder_paths.get_save_image_path = get_save_image_path
+    return folder_paths
+
+
+def _make_server():
+    server = types.ModuleType("server")
+
+    class PromptServer:
+        instance = None
+
+    PromptServer.instance = PromptServer()
+    PromptServer.instance.routes = _Routes()
+    server.PromptServer = PromptServer
+    return server
+
+
+def install_stubs(output_dir):
+    """Registers the stub modules in sys.modules (real ones, if already imported, are kept)."""
+    os.makedirs(output_dir, exist_ok=True)
+    sys.modules.setdefault("folder_paths", _make_folder_paths(output_dir))
+    sys.modules.setdefault("server", _make_server())
+
+
+def load_package(package_dir, name="beta_helpernodes"):
+    """Imports the node package from package_dir under 'name' and returns it."""
+    spec = importlib.util.spec_from_file_location(name, os.path.join(package_dir, "__init__.py"),
+                                                  submodule_search_locations=[package_dir])
+    package = importlib.util.module_from_spec(spec)
+    sys.modules[name] = package
+    spec.loader.exec_module(package)
+    return package
@@ -0,0 +1,376 @@
+"""
+CPU benchmark suite for the BETA Helpernodes.
+
+Runs every node on synthetic inputs in small/medium/large size tiers with stubbed
+ComfyUI modules (see comfy_stubs.py), records throughput and peak memory to JSON,
+and compares the results with a stored baseline using the limits in thresholds.json.
+Exits with status 1 when a limit is crossed, or when a case passes inputs the
+node does not declare in INPUT_TYPES() (unknown names, combo values, out-of-range numbers).
+
+    python benchmarks/run_benchmarks.py                      # all cases, all tiers
+    python benchmarks/run_benchmarks.py --tiers small --cases crop,stitch
+    python benchmarks/run_benchmarks.py --update-baseline    # accept the current numbers
+
+Each (case, tier) runs in its own subprocess, so the peak RSS of one case is not
+inflated by another. Nodes whose dependencies are missing are reported as skipped.
+"""
+import argparse
+import inspect
+import json
+import os
+import platform
+import resource
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+PACKAGE_DIR = os.path.dirname(BENCH_DIR)
+DEFAULT_THRESHOLDS = os.path.join(BENCH_DIR, "thresholds.json")
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, "baseline.json")
+DEFAULT_OUTPUT = os.path.join(BENCH_DIR, "results.json")
+
+# Input sizes per tier. frames/size: IMAGE batches, audio_seconds: stereo 48 kHz audio,
+# text_files: files in the LoadTextFromIndex directory, megapixels: WAN calculator target.
+TIERS = {
+    "small": {"frames": 16, "size": 256, "audio_seconds": 10, "text_files": 200, "megapixels": 0.5},
+    "medium": {"frames": 48, "size": 512, "audio_seconds": 60, "text_files": 2000, "megapixels": 1.0},
+    "large": {"frames": 48, "size": 1024, "audio_seconds": 300, "text_files": 10000, "megapixels": 2.0},
+}
+
+
+def _rss_high_water_bytes():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+# --- Synthetic inputs ---
+
+def _frames(torch, tier, seed=0):
+    generator = torch.Generator().manual_seed(seed)
+    return torch.rand(tier["frames"], tier["size"], tier["size"], 3, generator=generator)
+
+
+def _scene_frames(torch, tier):
+    """Four 'shots' with different base colours plus noise, so the detector finds cuts."""
+    frames = _frames(torch, tier, seed=1) * 0.1
+    shots = torch.tensor([[0.1, 0.2, 0.7], [0.8, 0.3, 0.1], [0.2, 0.8, 0.3], [0.6, 0.6, 0.6]])
+    for i in range(tier["frames"]):
+        frames[i] += shots[i * len(shots) // tier["frames"]]
+    return frames.clamp_(0, 1)
+
+
+class InvalidInputsError(ValueError):
+    """A case passes arguments the node does not declare (or accept) in INPUT_TYPES()."""
+
+
+def _node_call(node, *args, **kwargs):
+    """
+    Zero-argument call of the node's FUNCTION with the given arguments, after checking
+    them against INPUT_TYPES() (known input names, combo values, INT/FLOAT ranges), so
+    a benchmark can't silently run a fallback path after the node's options change.
+    """
+    fn = getattr(node, node.FUNCTION)
+    bound = inspect.signature(fn).bind(*args, **kwargs)
+    declared = {}
+    for section in node.INPUT_TYPES().values():
+        declared.update(section)
+    node_name = type(node).__name__
+    for name, value in bound.arguments.items():
+        spec = declared.get(name)
+        if spec is None:
+            raise InvalidInputsError(f"{node_name}: '{name}' is not an input in INPUT_TYPES()")
+        kind, options = spec[0], (spec[1] if len(spec) > 1 else {})
+        if isinstance(kind, (list, tuple)):
+            if value not in kind:
+                raise InvalidInputsError(f"{node_name}: {name}={value!r} is not one of {list(kind)}")
+        elif kind in ("INT", "FLOAT"):
+            if value < options.get("min", value) or value > options.get("max", value):
+                raise InvalidInputsError(f"{node_name}: {name}={value!r} is outside [{options.get('min')}, {options.get('max')}]")
+    return lambda: fn(*bound.args, **bound.kwargs)
+
+
+# --- Cases: setup(torch, nodes, tier, work_dir) returns (run, units, unit_name) ---
+
+def setup_crop(torch, nodes, tier, work_dir):
+    node, frames = nodes["BETACrop"](), _frames(torch, tier)
+    size = tier["size"]
+    return _node_call(node, frames, size // 4, size // 4, size // 2, size // 2, 8), tier["frames"], "frames"
+
+
+def setup_stitch(torch, nodes, tier, work_dir):
+    frames = _frames(torch, tier)
+    size = tier["size"]
+    cropped, crop_info = nodes["BETACrop"]().crop_video(frames, size // 4, size // 4, size // 2, size // 2, 8)
+    node = nodes["BETAStitch"]()
+    return _node_call(node, frames, cropped, crop_info), tier["frames"], "frames"
+
+
+def setup_sharpest_clip(torch, nodes, tier, work_dir):
+    node, frames = nodes["SharpestFrameClipper_BETA"](), _frames(torch, tier)
+    return _node_call(node, frames, tier["frames"], False, True, 0.9, False), tier["frames"], "frames"
+
+
+def setup_select_sharpest(torch, nodes, tier, work_dir):
+    node, frames = nodes["SelectSharpestFrames_BETA"](), _frames(torch, tier)
+    return _node_call(node, frames, 5, 3), tier["frames"], "frames"
+
+
+def setup_scene_detect(torch, nodes, tier, work_dir):
+    node, frames = nodes["BETASceneDetect_BETA"](), _scene_frames(torch, tier)
+    return _node_call(node, frames, 27.0), tier["frames"], "frames"
+
+
+def setup_load_text(torch, nodes, tier, work_dir):
+    text_dir = os.path.join(work_dir, "texts")
+    os.makedirs(text_dir, exist_ok=True)
+    for i in range(tier["text_files"]):
+        with open(os.path.join(text_dir, f"prompt_{i:06d}.txt"), "w", encoding="utf-8") as f:
+            f.write(f"prompt {i}, a synthetic caption with a few words\n" * 4)
+    node = nodes["LoadTextFromIndex_BETA"]()
+    reads = 200
+    step = max(1, tier["text_files"] // reads)
+    loads = [_node_call(node, text_dir, (i * step) % tier["text_files"]) for i in range(reads)]
+
+    def run():
+        for load in loads:
+            load()
+    return run, reads, "files"
+
+
+def _setup_save_audio(torch, nodes, tier, work_dir, **options):
+    sample_rate = 48000
+    samples = tier["audio_seconds"] * sample_rate
+    waveform = torch.sin(torch.linspace(0, 440 * 2 * 3.14159 * tier["audio_seconds"], samples)).repeat(1, 2, 1) * 0.5
+    save = _node_call(nodes["SaveAudioAdvanced_BETA"](), {"waveform": waveform, "sample_rate": sample_rate}, "bench/audio", **options)
+
+    def run():
+        result = save()
+        if not result or not result.get("ui", {}).get("audio"):
+            raise RuntimeError("SaveAudioAdvanced saved no file")
+    return run, tier["audio_seconds"], "audio seconds"
+
+
+def setup_save_audio_flac(torch, nodes, tier, work_dir):
+    return _setup_save_audio(torch, nodes, tier, work_dir, format="flac")
+
+
+def setup_save_audio_wav_stream(torch, nodes, tier, work_dir):
+    return _setup_save_audio(torch, nodes, tier, work_dir, format="wav", wav_encoding="PCM_16", stream_chunk_seconds=5.0)
+
+
+def setup_wan_calculator(torch, nodes, tier, work_dir):
+    node = nodes["WANResolutionCalculator_BETA"]()
+    calls = 50
+    # Table search plus both auto-fit loops: the 1.3B weights fit 5 GB, but 81 frames
+    # at the tier's resolution have to be shrunk to get there
+    fits = [_node_call(node, 81, tier["megapixels"], False, "16:9", 1.0, 1024, 1024,
+                       rounding_mode="optimal table", model_preset="Wan2.1 1.3B", vram_budget_gb=5.0,
+                       auto_fit=auto_fit, max_window_frames=0)
+            for auto_fit in ("reduce_megapixels", "reduce_frames")]
+
+    def run():
+        for i in range(calls):
+            fits[i % len(fits)]()
+    return run, calls, "calls"
+
+
+# case name -> (node keys it needs, setup)
+CASES = {
+    "crop": (("BETACrop",), setup_crop),
+    "stitch": (("BETACrop", "BETAStitch"), setup_stitch),
+    "sharpest_clip": (("SharpestFrameClipper_BETA",), setup_sharpest_clip),
+    "select_sharpest": (("SelectSharpestFrames_BETA",), setup_select_sharpest),
+    "scene_detect": (("BETASceneDetect_BETA",), setup_scene_detect),
+    "load_text": (("LoadTextFromIndex_BETA",), setup_load_text),
+    "save_audio_flac": (("SaveAudioAdvanced_BETA",), setup_save_audio_flac),
+    "save_audio_wav_stream": (("SaveAudioAdvanced_BETA",), setup_save_audio_wav_stream),
+    "wan_calculator": (("WANResolutionCalculator_BETA",), setup_wan_calculator),
+}
+
+
+def run_case(case, tier_name, repeat):
+    """Worker side: load the package, run one case and return its measurements."""
+    sys.path.insert(0, BENCH_DIR)
+    from comfy_stubs import install_stubs, load_package
+    work_dir = tempfile.mkdtemp(prefix="beta_bench_")
+    try:
+        install_stubs(os.path.join(work_dir, "output"))
+        package = load_package(PACKAGE_DIR)
+        import torch
+
+        required, setup = CASES[case]
+        missing = [key for key in required if key not in package.NODE_CLASS_MAPPINGS]
+        if missing:
+            return {"status": "skipped", "reason": f"node(s) not loaded: {', '.join(missing)}"}
+
+        tier = TIERS[tier_name]
+        run, units, unit_name = setup(torch, package.NODE_CLASS_MAPPINGS, tier, work_dir)
+        rss_before = _rss_high_water_bytes()
+        run() # Warm-up: lazy imports, caches, first-call allocations
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            run()
+            timings.append(time.perf_counter() - start)
+        rss_after = _rss_high_water_bytes()
+        seconds = statistics.median(timings)
+        return {
+            "status": "ok",
+            "seconds": seconds,
+            "throughput": units / seconds if seconds > 0 else None,
+            "unit": f"{unit_name}/s",
+            "peak_rss_mb": rss_after / 2**20,
+            "peak_rss_growth_mb": max(0, rss_after - rss_before) / 2**20, # Allocated by the node itself, not imports/inputs
+            "repeat": repeat,
+        }
+    except InvalidInputsError as e:
+        return {"status": "invalid", "reason": str(e)}
+    except Exception as e:
+        return {"status": "error", "reason": f"{type(e).__name__}: {e}"}
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def spawn_case(case, tier_name, repeat, verbose):
+    """Runs one case in a fresh interpreter and returns its result dict."""
+    with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as f:
+        result_path = f.name
+    try:
+        command = [sys.executable, os.path.abspath(__file__), "--worker", case, tier_name,
+                   "--repeat", str(repeat), "--result-file", result_path]
+        output = None if verbose else subprocess.DEVNULL
+        process = subprocess.run(command, stdout=output, stderr=output)
+        try:
+            with open(result_path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {"status": "error", "reason": f"worker exited with status {process.returncode}"}
+    finally:
+        os.remove(result_path)
+
+
+def compare(results, baseline, thresholds):
+    """Returns a list of regression messages (empty when everything is within limits)."""
+    default = thresholds.get("default", {})
+    overrides = thresholds.get("cases", {})
+    failures = []
+    for key, result in results.items():
+        base = baseline.get(key)
+        if result["status"] != "ok":
+            if result["status"] == "error" and base is not None:
+                failures.append(f"{key}: failed ({result['reason']}), baseline has a result")
+            continue
+        if not base or base.get("status") != "ok":
+            continue
+        limits = dict(default, **overrides.get(key.split("/")[0], {}), **overrides.get(key, {}))
+        max_slowdown = limits.get("max_slowdown")
+        if max_slowdown is not None and result["throughput"] and base["throughput"]:
+            slowdown = base["throughput"] / result["throughput"] - 1
+            if slowdown > max_slowdown:
+                failures.append(f"{key}: throughput {result['throughput']:.1f} {result['unit']} is {slowdown:.0%} slower than "
+                                f"baseline {base['throughput']:.1f} (limit {max_slowdown:.0%})")
+        max_growth = limits.get("max_memory_growth")
+        slack_mb = limits.get("memory_slack_mb", 0)
+        if max_growth is not None:
+            allowed = base["peak_rss_growth_mb"] * (1 + max_growth) + slack_mb
+            if result["peak_rss_growth_mb"] > allowed:
+                failures.append(f"{key}: peak memory growth {result['peak_rss_growth_mb']:.0f} MB exceeds "
+                                f"{allowed:.0f} MB (baseline {base['peak_rss_growth_mb']:.0f} MB)")
+        min_throughput = limits.get("min_throughput")
+        if min_throughput is not None and (result["throughput"] or 0) < min_throughput:
+            failures.append(f"{key}: throughput {result['throughput']:.1f} {result['unit']} below minimum {min_throughput}")
+    return failures
+
+
+def _load_json(path, default):
+    if not os.path.exists(path):
+        return default
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _write_json(path, data):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="CPU benchmarks for ComfyUI-BETA-Helpernodes")
+    parser.add_argument("--cases", default=",".join(CASES), help=f"Comma-separated cases (default: all): {', '.join(CASES)}")
+    parser.add_argument("--tiers", default=",".join(TIERS), help=f"Comma-separated size tiers (default: all): {', '.join(TIERS)}")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per case after one warm-up (median is reported)")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="Where to write the results JSON")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline results JSON to compare with")
+    parser.add_argument("--thresholds", default=DEFAULT_THRESHOLDS, help="Regression limits JSON")
+    parser.add_argument("--update-baseline", action="store_true", help="Store these results as the new baseline instead of comparing")
+    parser.add_argument("--verbose", action="store_true", help="Show the node output of the worker processes")
+    parser.add_argument("--worker", nargs=2, metavar=("CASE", "TIER"), help=argparse.SUPPRESS)
+    parser.add_argument("--result-file", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        result = run_case(*args.worker, max(1, args.repeat))
+        _write_json(args.result_file, result)
+        return 0
+
+    cases = [c.strip() for c in args.cases.split(",") if c.strip()]
+    tiers = [t.strip() for t in args.tiers.split(",") if t.strip()]
+    unknown = [c for c in cases if c not in CASES] + [t for t in tiers if t not in TIERS]
+    if unknown:
+        parser.error(f"unknown case(s)/tier(s): {', '.join(unknown)}")
+
+    results = {}
+    for case in cases:
+        for tier_name in tiers:
+            key = f"{case}/{tier_name}"
+            result = spawn_case(case, tier_name, max(1, args.repeat), args.verbose)
+            results[key] = result
+            if result["status"] == "ok":
+                print(f"{key:32s} {result['throughput']:10.1f} {result['unit']:16s} {result['seconds'] * 1000:9.1f} ms  "
+                      f"peak {result['peak_rss_mb']:7.0f} MB (+{result['peak_rss_growth_mb']:.0f} MB)")
+            else:
+                print(f"{key:32s} {result['status']}: {result['reason']}")
+
+    report = {
+        "machine": {"python": platform.python_version(), "platform": platform.platform(), "processor": platform.processor(),
+                    "cpu_count": os.cpu_count()},
+        "results": results,
+    }
+    _write_json(args.output, report)
+    print(f"Results written to {args.output}")
+
+    invalid = [key for key, result in results.items() if result["status"] == "invalid"]
+    if invalid:
+        # The case no longer matches the node's inputs: its numbers would measure a fallback path
+        print(f"{len(invalid)} case(s) with inputs not matching INPUT_TYPES(): {', '.join(invalid)}")
+        return 1
+
+    if args.update_baseline:
+        baseline = _load_json(args.baseline, {"results": {}})
+        baseline["machine"] = report["machine"]
+        baseline["results"].update(results)
+        _write_json(args.baseline, baseline)
+        print(f"Baseline updated: {args.baseline}")
+        return 0
+
+    baseline = _load_json(args.baseline, None)
+    if baseline is None:
+        print(f"No baseline at {args.baseline}; run with --update-baseline to create one. Nothing compared.")
+        return 0
+    failures = compare(results, baseline.get("results", {}), _load_json(args.thresholds, {}))
+    if failures:
+        print(f"{len(failures)} regression(s):")
+        for failure in failures:
+            print(f"  {failure}")
+        return 1
+    print("No regressions against the baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
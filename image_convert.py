@@ -0,0 +1,152 @@
+"""
+Batched IMAGE -> uint8 conversion shared by the frame-analysis nodes.
+
+FrameConverter turns a ComfyUI IMAGE batch ([B, H, W, C] float in 0..1, CPU or GPU
+tensor or numpy array) into uint8 RGB/BGR and grayscale one chunk of frames at a
+time. Each chunk is clamped, scaled and converted in a single vectorized pass into
+buffers that are allocated once and reused for the following chunks, instead of a
+.cpu().numpy() / clip / *255 / astype round trip per frame.
+
+The arrays yielded by iter_chunks are views into those buffers: use them (or copy
+them) before advancing the iterator.
+"""
+import numpy as np
+import torch
+from .lazy_imports import lazy_module, is_available
+
+cv2 = lazy_module("cv2")
+
+CHUNK_BYTES = 12 * 2**20 # Float32 working set per chunk; small enough to stay cache-resident
+
+# Grayscale uses one cv2.cvtColor call per chunk when OpenCV is installed. Without it,
+# the same fixed-point weights as cv2's RGB2GRAY for uint8 (BT.601, 15-bit) are applied
+# with numpy, so the values are identical either way
+_GRAY_SHIFT = 15
+_GRAY_WEIGHTS = (9798, 19235, 3735) # R, G, B
+_GRAY_ROUND = 1 << (_GRAY_SHIFT - 1)
+
+
+class FrameConverter:
+    """Chunked float -> uint8 / grayscale conversion with reusable buffers."""
+    def __init__(self, chunk_frames=None):
+        self.chunk_frames = chunk_frames
+        self._shape = None
+        self._buffers = None
+
+    def _get_buffers(self, chunk_frames, height, width, channels):
+        shape = (chunk_frames, height, width, channels)
+        if self._shape is None or self._shape[1:] != shape[1:] or self._shape[0] < chunk_frames:
+            self._shape = shape
+            self._buffers = {
+                "float": torch.empty(shape, dtype=torch.float32),
+                "uint8": torch.empty(shape, dtype=torch.uint8),
+                "ordered": None, # uint8 in BGR order, allocated on first use
+                "gray": np.empty(shape[:3], dtype=np.uint8),
+            }
+        return self._buffers
+
+    def _chunk_frames_for(self, height, width, channels):
+        if self.chunk_frames:
+            return self.chunk_frames
+        return max(1, CHUNK_BYTES // (height * width * channels * 4))
+
+    def iter_chunks(self, images, indices=None, rgb=True, gray=False, channel_order="RGB"):
+        """
+        Yields (frame_indices, uint8_frames, gray_frames) per chunk of 'images'.
+
+        indices: frames to convert (default: all, in order); non-contiguous lists are gathered.
+        uint8_frames: [n, H, W, C] uint8 numpy array in channel_order ("RGB" or "BGR"), or None if rgb=False.
+        gray_frames: [n, H, W] uint8 numpy array (OpenCV-identical weights), or None if gray=False.
+        """
+        if isinstance(images, np.ndarray):
+            images = torch.from_numpy(images)
+        if images.ndim == 3:
+            images = images.unsqueeze(-1) # [B, H, W] masks / single-channel
+        batch_size, height, width, channels = images.shape
+        if indices is None:
+            indices = range(batch_size)
+        indices = list(indices)
+        chunk_frames = self._chunk_frames_for(height, width, channels)
+        buffers = self._get_buffers(min(chunk_frames, max(1, len(indices))), height, width, channels)
+        chunk_frames = buffers["float"].shape[0]
+
+        for chunk_start in range(0, len(indices), chunk_frames):
+            chunk_indices = indices[chunk_start:chunk_start + chunk_frames]
+            n = len(chunk_indices)
+            uint8 = buffers["uint8"][:n]
+            self._fill_uint8(images, chunk_indices, buffers["float"][:n], uint8)
+            rgb_out = None
+            if rgb:
+                if channel_order == "BGR" and channels >= 3:
+                    if buffers["ordered"] is None:
+                        buffers["ordered"] = torch.empty_like(buffers["uint8"])
+                    ordered = buffers["ordered"][:n]
+                    for c in range(channels):
+                        ordered[..., c].copy_(uint8[..., 2 - c] if c < 3 else uint8[..., c])
+                    rgb_out = ordered.numpy()
+                else:
+                    rgb_out = uint8.numpy()
+            gray_out = self._to_gray(uint8.numpy(), buffers) if gray else None
+            yield chunk_indices, rgb_out, gray_out
+
+    @staticmethod
+    def _fill_uint8(images, chunk_indices, float_buf, uint8_buf):
+        """Copies the chunk into the buffers: clamp to 0..1, scale to 0..255, truncate to uint8."""
+        # Runs of consecutive frames are copied as one slice (all of them for a plain batch)
+        runs = []
+        for j, i in enumerate(chunk_indices):
+            if runs and i == runs[-1][1] + runs[-1][2]:
+                runs[-1][2] += 1
+            else:
+                runs.append([j, i, 1]) # [buffer offset, first frame, length]
+        if images.dtype == torch.uint8:
+            for j, i, length in runs:
+                uint8_buf[j:j + length].copy_(images[i:i + length])
+            return
+        float_np = float_buf.numpy()
+        direct = images.dtype == torch.float32 and images.device.type == "cpu"
+        for j, i, length in runs:
+            if direct:
+                # Clip straight from the input into the buffer, no staging copy
+                np.clip(images[i:i + length].numpy(), 0, 1, out=float_np[j:j + length])
+            else:
+                float_buf[j:j + length].copy_(images[i:i + length]) # Device transfer and dtype cast in one copy
+                np.clip(float_np[j:j + length], 0, 1, out=float_np[j:j + length])
+        np.multiply(float_np, 255, out=float_np)
+        np.copyto(uint8_buf.numpy(), float_np, casting="unsafe") # Truncates, like astype(np.uint8)
+
+    @staticmethod
+    def _to_gray(uint8_frames, buffers):
+        gray = buffers["gray"][:uint8_frames.shape[0]]
+        n, height, width, channels = uint8_frames.shape
+        if channels < 3:
+            np.copyto(gray, uint8_frames[..., 0])
+            return gray
+        if is_available("cv2"):
+            # The chunk as one tall image: a single SIMD pass for all frames
+            code = cv2.COLOR_RGB2GRAY if channels == 3 else cv2.COLOR_RGBA2GRAY
+            cv2.cvtColor(uint8_frames.reshape(n * height, width, channels), code, dst=gray.reshape(n * height, width))
+            return gray
+        if buffers.get("acc") is None or buffers["acc"].shape[0] < n:
+            buffers["acc"] = np.empty(gray.shape, dtype=np.int32)
+            buffers["tmp"] = np.empty(gray.shape, dtype=np.int32)
+        acc, tmp = buffers["acc"][:n], buffers["tmp"][:n]
+        np.multiply(uint8_frames[..., 0], _GRAY_WEIGHTS[0], out=acc, dtype=np.int32)
+        np.multiply(uint8_frames[..., 1], _GRAY_WEIGHTS[1], out=tmp, dtype=np.int32)
+        acc += tmp
+        np.multiply(uint8_frames[..., 2], _GRAY_WEIGHTS[2], out=tmp, dtype=np.int32)
+        acc += tmp
+        acc += _GRAY_ROUND
+        np.right_shift(acc, _GRAY_SHIFT, out=acc)
+        np.copyto(gray, acc, casting="unsafe")
+        return gray
+
+
+def frame_to_gray(image):
+    """Grayscale uint8 [H, W] copy of a single IMAGE frame ([H, W, C] tensor or array)."""
+    if isinstance(image, np.ndarray) and image.ndim == 2 and image.dtype == np.uint8:
+        return image
+    if isinstance(image, np.ndarray):
+        image = torch.from_numpy(image)
+    _, _, gray = next(FrameConverter(chunk_frames=1).iter_chunks(image.unsqueeze(0), rgb=False, gray=True))
+    return gray[0]
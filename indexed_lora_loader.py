@@ -1,24 +1,488 @@
 import os
-from folder_paths import get_filename_list, get_full_path
-import comfy.sd
-import comfy.utils
+import json
+import struct
+import time
+import threading
+import functools
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from folder_paths import get_filename_list, get_folder_paths, get_full_path, supported_pt_extensions
+import torch
+from .lazy_imports import lazy_module, is_available
+from .instrumentation import log, log_enabled
+
+safetensors = lazy_module("safetensors")
+comfy_lora = lazy_module("comfy.lora")
+comfy_lora_convert = lazy_module("comfy.lora_convert") # Only present in newer ComfyUI versions
+comfy_sd = lazy_module("comfy.sd")
+comfy_utils = lazy_module("comfy.utils")
+
+
+def _state_dict_nbytes(state_dict):
+    """Total size in bytes of the tensors held in a LoRA state dict."""
+    total = 0
+    for value in state_dict.values():
+        if hasattr(value, "element_size") and hasattr(value, "nelement"):
+            total += value.element_size() * value.nelement()
+    return total
+
+
+class LoRAStateDictCache:
+    """
+    Process-wide LRU cache of parsed LoRA state dicts.
+    Entries are keyed by real path plus file mtime and size, so a replaced or
+    edited LoRA is re-read, and the total tensor size is bounded by a byte
+    budget with least-recently-used eviction. A budget of 0 disables caching.
+    An optional 'variant' in the key separates partial loads (e.g. only the
+    keys matching one model) from the full state dict of the same file.
+    """
+    def __init__(self, max_bytes):
+        self.max_bytes = max(0, int(max_bytes))
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict() # key -> (state_dict, nbytes)
+        self._total_bytes = 0
+        self._inflight = {} # key -> _PendingLoad for loads currently running
+        self._lock = threading.RLock()
+        self._prefetch_executor = None
+
+    @staticmethod
+    def make_key(path, variant=None):
+        st = os.stat(path)
+        return (os.path.realpath(path), st.st_mtime_ns, st.st_size, variant)
+
+    def set_budget(self, max_bytes):
+        with self._lock:
+            self.max_bytes = max(0, int(max_bytes))
+            self._evict()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, state_dict):
+        nbytes = _state_dict_nbytes(state_dict)
+        with self._lock:
+            # Drop entries for older versions of the same file
+            for stale_key in [k for k in self._entries if k[0] == key[0] and k[1:3] != key[1:3]]:
+                self._remove(stale_key)
+            if nbytes > self.max_bytes:
+                return
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (state_dict, nbytes)
+            self._total_bytes += nbytes
+            self._evict()
+
+    def get_or_load(self, path, loader, variant=None):
+        """
+        Return the cached state dict for 'path', calling loader(path) on a miss.
+        If the same file is already being loaded (e.g. by a prefetch), waits for
+        that load instead of reading the file a second time.
+        """
+        key = self.make_key(path, variant)
+        with self._lock:
+            state_dict = self.get(key)
+            if state_dict is not None:
+                return state_dict
+            pending = self._inflight.get(key)
+            is_owner = pending is None
+            if is_owner:
+                pending = _PendingLoad()
+                self._inflight[key] = pending
+
+        if not is_owner:
+            pending.done.wait()
+            if pending.error is not None:
+                raise pending.error
+            return pending.result
+
+        try:
+            pending.result = loader(path)
+            self.put(key, pending.result)
+            return pending.result
+        except Exception as e:
+            pending.error = e
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            pending.done.set()
+
+    def prefetch(self, path, loader, variant=None):
+        """Schedule a background load of 'path' unless it is already cached or loading."""
+        try:
+            key = self.make_key(path, variant)
+        except OSError:
+            return False
+        with self._lock:
+            if self.max_bytes == 0 or key in self._entries or key in self._inflight:
+                return False
+            if self._prefetch_executor is None:
+                self._prefetch_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="beta-lora-prefetch")
+        self._prefetch_executor.submit(self._prefetch_worker, path, loader, variant)
+        return True
+
+    def _prefetch_worker(self, path, loader, variant):
+        try:
+            self.get_or_load(path, loader, variant)
+        except Exception as e:
+            log("warning", f"[IndexedLoRALoader Warning] Background prefetch of '{path}' failed: {e}")
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def _remove(self, key):
+        _, nbytes = self._entries.pop(key)
+        self._total_bytes -= nbytes
+
+    def _evict(self):
+        while self._entries and self._total_bytes > self.max_bytes:
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+            self.evictions += 1
+
+
+class _PendingLoad:
+    """Result slot for a LoRA load that other threads can wait on."""
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+DEFAULT_LORA_CACHE_MB = 2048
+LORA_CACHE = LoRAStateDictCache(DEFAULT_LORA_CACHE_MB * 1024 * 1024)
+
+
+def _load_lora_file(lora_path):
+    return comfy_utils.load_torch_file(lora_path, safe_load=True)
+
+
+class LoRAFileIndex:
+    """
+    In-memory list of the files in the 'loras' folders.
+    Each directory's listing is cached with its mtime; a refresh stats every
+    directory once and only re-lists the ones whose mtime changed (a file
+    added, removed or renamed directly inside it), so large libraries on
+    network shares don't pay a full recursive scan per request.
+    'version' increments whenever the list changes and serves as an ETag.
+    """
+    MIN_REFRESH_INTERVAL = 1.0 # seconds between directory stat passes
+
+    def __init__(self, folder_name="loras"):
+        self.folder_name = folder_name
+        self.version = 0
+        self._dirs = {} # dir path -> (mtime_ns, [file names], [subdir paths])
+        self._names = ["none"]
+        self._last_refresh = None
+        self._lock = threading.Lock()
+
+    def get_names(self, force=False):
+        """["none"] followed by the sorted LoRA names relative to their root folder."""
+        with self._lock:
+            now = time.monotonic()
+            if force or self._last_refresh is None or now - self._last_refresh >= self.MIN_REFRESH_INTERVAL:
+                self._refresh()
+                self._last_refresh = now
+            return self._names
+
+    def _refresh(self):
+        extensions = tuple(ext.lower() for ext in supported_pt_extensions)
+        names = set()
+        seen_dirs = set()
+        changed = False
+        for root in get_folder_paths(self.folder_name):
+            pending = [root]
+            while pending:
+                directory = pending.pop()
+                if directory in seen_dirs:
+                    continue
+                seen_dirs.add(directory)
+                try:
+                    mtime_ns = os.stat(directory).st_mtime_ns
+                except OSError:
+                    continue
+                cached = self._dirs.get(directory)
+                if cached is None or cached[0] != mtime_ns:
+                    cached = (mtime_ns,) + self._list_directory(directory, extensions)
+                    self._dirs[directory] = cached
+                    changed = True
+                _, files, subdirs = cached
+                for file_name in files:
+                    names.add(os.path.relpath(os.path.join(directory, file_name), root))
+                pending.extend(subdirs)
+
+        removed = [d for d in self._dirs if d not in seen_dirs]
+        for directory in removed:
+            del self._dirs[directory]
+        if changed or removed:
+            self._names = ["none"] + sorted(names)
+            self.version += 1
+
+    @staticmethod
+    def _list_directory(directory, extensions):
+        files = []
+        subdirs = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=True):
+                            if not entry.name.startswith("."):
+                                subdirs.append(entry.path)
+                        elif entry.name.lower().endswith(extensions):
+                            files.append(entry.name)
+                    except OSError:
+                        continue
+        except OSError as e:
+            log("warning", f"[IndexedLoRALoader Warning] Could not list '{directory}': {e}")
+        return files, subdirs
+
+
+LORA_INDEX = LoRAFileIndex("loras")
+
+
+# --- Header-only safetensors access ---
+# A .safetensors file starts with an 8-byte little-endian header length followed
+# by a JSON header (tensor dtypes/shapes/offsets plus optional "__metadata__").
+# Reading just that header is enough for trigger words and training metadata.
+_SAFETENSORS_MAX_HEADER_BYTES = 100 * 1024 * 1024
+
+# Explicit trigger keys written by common trainers, checked in order
+_TRIGGER_METADATA_KEYS = ("modelspec.trigger_phrase", "trigger_phrase", "trigger_words", "trigger_word")
+
+# Training metadata surfaced in the lora_info output
+_INFO_METADATA_KEYS = (
+    "modelspec.title", "modelspec.architecture", "ss_output_name", "ss_base_model_version",
+    "ss_sd_model_name", "ss_network_module", "ss_network_dim", "ss_network_alpha",
+    "ss_resolution", "ss_num_train_images", "ss_num_epochs", "ss_learning_rate",
+)
+
+
+def _is_safetensors(path):
+    return path.lower().endswith((".safetensors", ".sft"))
+
+
+@functools.lru_cache(maxsize=256)
+def _read_safetensors_header_cached(real_path, mtime_ns, size):
+    with open(real_path, "rb") as f:
+        length_bytes = f.read(8)
+        if len(length_bytes) != 8:
+            raise ValueError("file is too small to be a safetensors file")
+        header_length = struct.unpack("<Q", length_bytes)[0]
+        if header_length > min(size - 8, _SAFETENSORS_MAX_HEADER_BYTES):
+            raise ValueError(f"invalid safetensors header length {header_length}")
+        return json.loads(f.read(header_length))
+
+
+def read_safetensors_header(path):
+    """Parse only the JSON header of a .safetensors file, cached per file mtime/size."""
+    st = os.stat(path)
+    return _read_safetensors_header_cached(os.path.realpath(path), st.st_mtime_ns, st.st_size)
+
+
+def read_safetensors_metadata(path):
+    """The '__metadata__' dict of a .safetensors file ({} if absent or unreadable)."""
+    try:
+        metadata = read_safetensors_header(path).get("__metadata__") or {}
+    except Exception as e:
+        log("warning", f"[IndexedLoRALoader Warning] Could not read safetensors header of '{path}': {e}")
+        return {}
+    return metadata if isinstance(metadata, dict) else {}
+
+
+def _trigger_word_from_metadata(metadata):
+    """Trigger word from training metadata, or None if it doesn't name one."""
+    for key in _TRIGGER_METADATA_KEYS:
+        value = metadata.get(key)
+        if isinstance(value, str) and value.strip():
+            return value.strip()
+
+    # Kohya-style trainers record caption tag counts per dataset; the most
+    # frequent tag is almost always the instance/trigger token.
+    tag_frequency = metadata.get("ss_tag_frequency")
+    if tag_frequency:
+        try:
+            datasets = json.loads(tag_frequency) if isinstance(tag_frequency, str) else tag_frequency
+            totals = Counter()
+            for tags in datasets.values():
+                for tag, count in tags.items():
+                    if tag.strip():
+                        totals[tag.strip()] += int(count)
+            if totals:
+                return totals.most_common(1)[0][0]
+        except Exception as e:
+            log("warning", f"[IndexedLoRALoader Warning] Could not parse ss_tag_frequency metadata: {e}")
+    return None
+
+
+def _summarize_lora_metadata(lora_name, metadata):
+    info = {"file": lora_name}
+    for key in _INFO_METADATA_KEYS:
+        if key in metadata:
+            info[key] = metadata[key]
+    return info
+
+
+def _lora_key_map(model, clip):
+    """LoRA key prefix -> model/clip weight key, as built by comfy.sd.load_lora_for_models."""
+    key_map = {}
+    if model is not None:
+        key_map = comfy_lora.model_lora_keys_unet(model.model, key_map)
+    if clip is not None:
+        key_map = comfy_lora.model_lora_keys_clip(clip.cond_stage_model, key_map)
+    return key_map
+
+
+def _lora_target_keys(model, clip):
+    """LoRA key prefixes that map onto layers of the given model/clip."""
+    return frozenset(_lora_key_map(model, clip))
+
+
+def _lora_key_matches(key, target_keys):
+    # LoRA tensors are named '<layer prefix>.<lora part>' (e.g. '.lora_up.weight',
+    # '.alpha'); the prefix may itself contain dots, so try every cut point.
+    pos = key.find(".")
+    while pos != -1:
+        if key[:pos] in target_keys:
+            return True
+        pos = key.find(".", pos + 1)
+    return False
+
+
+def _load_lora_file_matching(lora_path, target_keys):
+    """
+    Memory-map a .safetensors LoRA and materialize only the tensors whose
+    layer prefix is in 'target_keys'; untouched tensors are never read.
+    Falls back to a full load if nothing matches (e.g. a key format that
+    ComfyUI only recognizes after conversion).
+    """
+    with safetensors.safe_open(lora_path, framework="pt", device="cpu") as f:
+        keys = [k for k in f.keys() if _lora_key_matches(k, target_keys)]
+        if keys:
+            return {k: f.get_tensor(k) for k in keys}
+    log("warning", f"[IndexedLoRALoader Warning] No LoRA keys in '{lora_path}' matched the model layers. Loading the full file.")
+    return _load_lora_file(lora_path)
+
+
+# --- Multi-LoRA stacking ---
+# (up, down) weight suffixes of plain low-rank LoRA layers that can be pre-merged
+_LORA_UP_DOWN_SUFFIXES = (
+    (".lora_up.weight", ".lora_down.weight"),
+    (".lora_B.weight", ".lora_A.weight"),
+    (".lora.up.weight", ".lora.down.weight"),
+)
+# Extra tensors that change how a layer is applied; such layers are left unmerged
+_LORA_UNMERGEABLE_SUFFIXES = (".lora_mid.weight", ".dora_scale", ".reshape_weight")
+
+
+def _convert_lora(lora_data):
+    if is_available("comfy.lora_convert"):
+        return comfy_lora_convert.convert_lora(lora_data)
+    return lora_data
+
+
+def _premerge_lora_deltas(weighted_loras):
+    """
+    Sum the plain low-rank layers of several weighted LoRAs into one full
+    '<prefix>.diff' tensor per layer, so the per-step patch cost scales with
+    the number of unique layers rather than the number of LoRAs.
+    Returns (merged state dict, [(leftover state dict, weight), ...]) where
+    the leftovers hold the tensors that could not be merged.
+    The input state dicts (which may be shared cache entries) are not modified.
+    """
+    merged = {}
+    merged_dtypes = {}
+    leftovers = []
+    for lora_data, weight in weighted_loras:
+        remaining = dict(lora_data)
+        for key in list(remaining):
+            if key not in remaining:
+                continue
+            for up_suffix, down_suffix in _LORA_UP_DOWN_SUFFIXES:
+                if not key.endswith(up_suffix):
+                    continue
+                prefix = key[:-len(up_suffix)]
+                down_key = prefix + down_suffix
+                if down_key not in remaining or any(prefix + s in remaining for s in _LORA_UNMERGEABLE_SUFFIXES):
+                    break
+                up = remaining.pop(key)
+                down = remaining.pop(down_key)
+                alpha = remaining.pop(prefix + ".alpha", None)
+                rank = down.shape[0]
+                scale = weight * (float(alpha) / rank if alpha is not None else 1.0)
+                # Conv LoRAs: up is [out, r, 1, 1] and down is [r, in, kh, kw]
+                delta = torch.mm(up.flatten(1).float(), down.flatten(1).float())
+                delta = delta.reshape(up.shape[:1] + down.shape[1:]) * scale
+                diff_key = prefix + ".diff"
+                if diff_key in merged:
+                    merged[diff_key] += delta
+                else:
+                    merged[diff_key] = delta
+                    merged_dtypes[diff_key] = up.dtype
+                break
+        if remaining:
+            leftovers.append((remaining, weight))
+    for diff_key, dtype in merged_dtypes.items():
+        merged[diff_key] = merged[diff_key].to(dtype)
+    return merged, leftovers
+
+
+def _apply_loras_single_pass(model, clip, key_map, weighted_loras, strength_model, strength_clip):
+    """
+    Apply several (state dict, weight) LoRAs with one clone of the model and
+    clip patchers, instead of one clone per chained loader node.
+    """
+    new_model = model.clone() if model is not None else None
+    new_clip = clip.clone() if clip is not None else None
+    patched_keys = set()
+    loaded_keys = set()
+    for lora_data, weight in weighted_loras:
+        loaded = comfy_lora.load_lora(lora_data, key_map)
+        loaded_keys.update(loaded)
+        if new_model is not None:
+            patched_keys.update(new_model.add_patches(loaded, strength_model * weight))
+        if new_clip is not None:
+            patched_keys.update(new_clip.add_patches(loaded, strength_clip * weight))
+    not_loaded = loaded_keys - patched_keys
+    if not_loaded:
+        log("warning", f"[IndexedLoRALoader Warning] {len(not_loaded)} LoRA layer(s) did not match the model or clip and were skipped.")
+    return new_model, new_clip
+
 
 class IndexedLoRALoader:
     MAX_LORA_SLOTS = 20
 
     @classmethod
     def INPUT_TYPES(cls):
-        try:
-            lora_list = ["none"] + get_filename_list("loras")
-        except Exception as e:
-            print(f"[IndexedLoRALoader Warning] Could not fetch LoRA list: {e}. Defaulting to ['none'].")
-            lora_list = ["none"]
-            
+        # The LoRA list is not repeated in every slot definition (that made
+        # /object_info several MB with large libraries). js/betaHelperNodes.js
+        # fetches it once from /beta_helpernodes/loras and turns the slots into
+        # combo widgets; a missing file is reported when the node runs.
         optional_inputs = {}
-        default_lora = lora_list[0]
-
         for i in range(1, cls.MAX_LORA_SLOTS + 1):
-            optional_inputs[f"lora_{i}"] = (lora_list, {"default": default_lora})
+            optional_inputs[f"lora_{i}"] = ("STRING", {"default": "none"})
         
         return {
             "required": {
@@ -31,49 +495,258 @@ class IndexedLoRALoader:
                 # Add the new field for the trigger suffix
                 "trigger_suffix": ("STRING", {"default": "_lora"}), # New input field
             },
-            "optional": optional_inputs
+            "optional": {
+                # Non-slot inputs go before the lora_N slots so the widget order matches
+                # what js/betaHelperNodes.js rebuilds (static widgets first, then slots).
+                # The JS saves widget values by name and recognises the older positional
+                # layout (required widgets directly followed by the slots) on load.
+                # Shared by all loader nodes; the most recently executed node's value applies
+                "cache_size_mb": ("INT", {"default": DEFAULT_LORA_CACHE_MB, "min": 0, "max": 262144, "step": 64}),
+                # Load upcoming slots into the cache on a background thread after this one
+                "prefetch_mode": (["off", "next", "slots"], {"default": "off"}),
+                "prefetch_slots": ("STRING", {"default": "", "tooltip": "Comma-separated slot numbers to prefetch when prefetch_mode is 'slots', e.g. '2,3,5'"}),
+                "load_mode": (["full", "model_keys_only"], {"default": "full", "tooltip": "model_keys_only memory-maps .safetensors LoRAs and reads only the tensors that match layers of the connected model/clip"}),
+                "trigger_source": (["filename", "metadata"], {"default": "filename", "tooltip": "metadata reads the trigger word from the .safetensors header, falling back to the filename"}),
+                # 'stack' applies several slots at once instead of the single 'index' slot
+                "mode": (["index", "stack"], {"default": "index"}),
+                "stack_weights": ("STRING", {"default": "", "tooltip": "Stack mode slot weights: 'slot:weight' pairs ('1:0.8, 3:0.5') or a weight per slot ('0.8, 0, 0.5'). Empty applies every configured slot at weight 1."}),
+                "premerge_deltas": ("BOOLEAN", {"default": False, "tooltip": "Stack mode: sum same-layer LoRA deltas into one patch per layer (uses more RAM, faster sampling with many LoRAs)"}),
+                **optional_inputs,
+            }
         }
 
-    RETURN_TYPES = ("MODEL", "CLIP", "STRING")
-    RETURN_NAMES = ("model", "clip", "trigger_word")
+    RETURN_TYPES = ("MODEL", "CLIP", "STRING", "STRING")
+    RETURN_NAMES = ("model", "clip", "trigger_word", "lora_info")
     FUNCTION = "load_indexed_lora"
     CATEGORY = "BETA Nodes"
 
+    @classmethod
+    def IS_CHANGED(cls, number_of_loras=None, index=None, mode=None, stack_weights=None, **kwargs):
+        """
+        Fingerprint of the selected LoRA file(s) from size and mtime only, so
+        ComfyUI re-runs the node when a file is replaced and otherwise keeps its
+        cached output. Model/clip inputs are covered by ComfyUI's own input hashing.
+        Linked inputs are not passed here; when the selection is not known
+        (e.g. a linked index), all configured slots are fingerprinted.
+        """
+        if number_of_loras is None:
+            number_of_loras = max([int(key[5:]) for key in kwargs if key.startswith("lora_") and key[5:].isdigit()], default=0)
+        if mode == "stack" and stack_weights is not None:
+            slots = sorted(cls._parse_stack_weights(stack_weights, number_of_loras, verbose=False))
+        elif mode == "index" and index is not None:
+            slots = [index] if 1 <= index <= number_of_loras else []
+        else:
+            slots = range(1, number_of_loras + 1)
+        parts = []
+        for slot in slots:
+            lora_name = kwargs.get(f"lora_{slot}")
+            if not lora_name or lora_name.lower() == "none":
+                continue
+            lora_path = get_full_path("loras", lora_name)
+            try:
+                st = os.stat(lora_path)
+                parts.append(f"{lora_name}:{st.st_size}:{st.st_mtime_ns}")
+            except (OSError, TypeError):
+                parts.append(f"{lora_name}:missing")
+        return "|".join(parts)
+
     # Add 'trigger_suffix' to the method signature
-    def load_indexed_lora(self, model, clip, number_of_loras, index, strength_model, strength_clip, trigger_suffix, **kwargs):
+    def load_indexed_lora(self, model, clip, number_of_loras, index, strength_model, strength_clip, trigger_suffix, cache_size_mb=DEFAULT_LORA_CACHE_MB,
+                          prefetch_mode="off", prefetch_slots="", load_mode="full", trigger_source="filename",
+                          mode="index", stack_weights="", premerge_deltas=False, **kwargs):
+        if mode == "stack":
+            return self._load_lora_stack(model, clip, number_of_loras, strength_model, strength_clip, trigger_suffix, cache_size_mb,
+                                         load_mode, trigger_source, stack_weights, premerge_deltas, kwargs)
+
         if not (1 <= index <= number_of_loras):
-            print(f"[IndexedLoRALoader] Warning: Index {index} is out of the current LoRA range (1-{number_of_loras}). Returning original model and clip.")
-            return (model, clip, "")
+            log("warning", f"[IndexedLoRALoader] Warning: Index {index} is out of the current LoRA range (1-{number_of_loras}). Returning original model and clip.")
+            return (model, clip, "", "")
         
         lora_key = f"lora_{index}"
         selected_lora_name_from_widget = kwargs.get(lora_key)
 
         if not selected_lora_name_from_widget or selected_lora_name_from_widget.lower() == "none":
-            print(f"[IndexedLoRALoader] Info: LoRA slot '{lora_key}' (index {index}) is not configured or set to 'none'. Returning original model and clip.")
-            return (model, clip, "")
+            log("info", f"[IndexedLoRALoader] Info: LoRA slot '{lora_key}' (index {index}) is not configured or set to 'none'. Returning original model and clip.")
+            return (model, clip, "", "")
         
         # Pass the trigger_suffix to _extract_trigger_word
         trigger_word = self._extract_trigger_word(selected_lora_name_from_widget, trigger_suffix)
         
         lora_path = get_full_path("loras", selected_lora_name_from_widget)
         if not lora_path:
-            print(f"[IndexedLoRALoader] Error: LoRA file '{selected_lora_name_from_widget}' not found. Returning original model and clip.")
-            return (model, clip, trigger_word if trigger_word else "")
+            log("error", f"[IndexedLoRALoader] Error: LoRA file '{selected_lora_name_from_widget}' not found. Returning original model and clip.")
+            return (model, clip, trigger_word if trigger_word else "", "")
+
+        metadata = read_safetensors_metadata(lora_path) if _is_safetensors(lora_path) else {}
+        lora_info = json.dumps(_summarize_lora_metadata(selected_lora_name_from_widget, metadata), indent=2)
+        if trigger_source == "metadata":
+            trigger_word = _trigger_word_from_metadata(metadata) or trigger_word
 
+        loader, variant = self._get_loader(load_mode, lora_path, model, clip)
+
+        LORA_CACHE.set_budget(cache_size_mb * 1024 * 1024)
         try:
-            lora_data = comfy.utils.load_torch_file(lora_path, safe_load=True)
+            lora_data = LORA_CACHE.get_or_load(lora_path, loader, variant)
+            if log_enabled("debug"): # One line per execution, too noisy for index sweeps otherwise
+                stats = LORA_CACHE.stats()
+                log("debug", f"[IndexedLoRALoader] LoRA cache hits={stats['hits']} misses={stats['misses']} "
+                    f"size={stats['bytes'] / (1024 * 1024):.1f}/{stats['max_bytes'] / (1024 * 1024):.0f} MB ({stats['entries']} entries).")
         except Exception as e:
-            print(f"[IndexedLoRALoader] Error loading LoRA file '{selected_lora_name_from_widget}' from path '{lora_path}': {e}. Returning original model and clip.")
-            return (model, clip, trigger_word if trigger_word else "")
+            log("error", f"[IndexedLoRALoader] Error loading LoRA file '{selected_lora_name_from_widget}' from path '{lora_path}': {e}. Returning original model and clip.")
+            return (model, clip, trigger_word if trigger_word else "", lora_info)
+
+        if prefetch_mode != "off":
+            self._prefetch_slots(self._get_prefetch_indices(prefetch_mode, prefetch_slots, index, number_of_loras), kwargs, load_mode, model, clip)
 
         try:
-            model_lora, clip_lora = comfy.sd.load_lora_for_models(model, clip, lora_data, strength_model, strength_clip)
+            model_lora, clip_lora = comfy_sd.load_lora_for_models(model, clip, lora_data, strength_model, strength_clip)
         except Exception as e:
-            print(f"[IndexedLoRALoader] Error applying LoRA '{selected_lora_name_from_widget}' to models: {e}. Returning original model and clip.")
-            return (model, clip, trigger_word if trigger_word else "")
+            log("error", f"[IndexedLoRALoader] Error applying LoRA '{selected_lora_name_from_widget}' to models: {e}. Returning original model and clip.")
+            return (model, clip, trigger_word if trigger_word else "", lora_info)
         
-        return (model_lora, clip_lora, trigger_word)
+        return (model_lora, clip_lora, trigger_word, lora_info)
+
+    def _load_lora_stack(self, model, clip, number_of_loras, strength_model, strength_clip, trigger_suffix, cache_size_mb,
+                         load_mode, trigger_source, stack_weights, premerge_deltas, slot_values):
+        """Stack mode: load the weighted slots in parallel and apply them in one patch pass."""
+        entries = [] # (slot, lora name, path, weight)
+        for slot, weight in self._parse_stack_weights(stack_weights, number_of_loras).items():
+            lora_name = slot_values.get(f"lora_{slot}")
+            if not lora_name or lora_name.lower() == "none":
+                continue
+            lora_path = get_full_path("loras", lora_name)
+            if not lora_path:
+                log("error", f"[IndexedLoRALoader] Error: LoRA file '{lora_name}' (slot {slot}) not found. Skipping it in the stack.")
+                continue
+            entries.append((slot, lora_name, lora_path, weight))
+
+        if not entries:
+            log("info", "[IndexedLoRALoader] Info: No configured LoRA slots selected for stacking. Returning original model and clip.")
+            return (model, clip, "", "")
+
+        trigger_words = []
+        infos = []
+        for slot, lora_name, lora_path, weight in entries:
+            metadata = read_safetensors_metadata(lora_path) if _is_safetensors(lora_path) else {}
+            trigger_word = self._extract_trigger_word(lora_name, trigger_suffix)
+            if trigger_source == "metadata":
+                trigger_word = _trigger_word_from_metadata(metadata) or trigger_word
+            if trigger_word and trigger_word not in trigger_words:
+                trigger_words.append(trigger_word)
+            infos.append({"slot": slot, "weight": weight, **_summarize_lora_metadata(lora_name, metadata)})
+        lora_info = json.dumps(infos, indent=2)
+
+        try:
+            key_map = _lora_key_map(model, clip)
+        except Exception as e:
+            log("error", f"[IndexedLoRALoader] Error building the model key map: {e}. Returning original model and clip.")
+            return (model, clip, ", ".join(trigger_words), lora_info)
+        target_keys = frozenset(key_map)
+
+        LORA_CACHE.set_budget(cache_size_mb * 1024 * 1024)
+
+        def load_entry(entry):
+            loader, variant = self._get_loader(load_mode, entry[2], model, clip, target_keys)
+            return LORA_CACHE.get_or_load(entry[2], loader, variant)
+
+        try:
+            with ThreadPoolExecutor(max_workers=min(4, len(entries)), thread_name_prefix="beta-lora-stack") as executor:
+                loaded = list(executor.map(load_entry, entries))
+        except Exception as e:
+            log("error", f"[IndexedLoRALoader] Error loading LoRA stack: {e}. Returning original model and clip.")
+            return (model, clip, ", ".join(trigger_words), lora_info)
+
+        try:
+            weighted_loras = [(_convert_lora(lora_data), entry[3]) for lora_data, entry in zip(loaded, entries)]
+            if premerge_deltas:
+                merged, leftovers = _premerge_lora_deltas(weighted_loras)
+                weighted_loras = ([(merged, 1.0)] if merged else []) + leftovers
+            model_lora, clip_lora = _apply_loras_single_pass(model, clip, key_map, weighted_loras, strength_model, strength_clip)
+        except Exception as e:
+            log("error", f"[IndexedLoRALoader] Error applying LoRA stack to models: {e}. Returning original model and clip.")
+            return (model, clip, ", ".join(trigger_words), lora_info)
+
+        names = ", ".join(f"{entry[1]}@{entry[3]:g}" for entry in entries)
+        log("info", f"[IndexedLoRALoader] Info: Applied {len(entries)} stacked LoRA(s) in one patch pass: {names}")
+        return (model_lora, clip_lora, ", ".join(trigger_words), lora_info)
+
+    @staticmethod
+    def _parse_stack_weights(stack_weights, number_of_loras, verbose=True):
+        """
+        {slot: weight} from 'slot:weight' pairs or a plain weight vector over
+        slots 1..N. An empty string selects every slot at weight 1.
+        """
+        parts = [part.strip() for part in (stack_weights or "").split(",") if part.strip()]
+        if not parts:
+            return {slot: 1.0 for slot in range(1, number_of_loras + 1)}
+        weights = {}
+        for position, part in enumerate(parts, start=1):
+            try:
+                if ":" in part:
+                    slot_text, weight_text = part.split(":", 1)
+                    slot, weight = int(slot_text), float(weight_text)
+                else:
+                    slot, weight = position, float(part)
+            except ValueError:
+                if verbose:
+                    log("warning", f"[IndexedLoRALoader Warning] Ignoring invalid stack weight '{part}'.")
+                continue
+            if not (1 <= slot <= number_of_loras):
+                if verbose:
+                    log("warning", f"[IndexedLoRALoader Warning] Stack slot {slot} is outside the current LoRA range (1-{number_of_loras}). Ignoring it.")
+                continue
+            if weight != 0:
+                weights[slot] = weight
+        return weights
+
+    def _get_loader(self, load_mode, lora_path, model, clip, target_keys=None):
+        """(loader, cache variant) for reading 'lora_path' in the given load mode."""
+        if load_mode != "model_keys_only" or not _is_safetensors(lora_path):
+            return _load_lora_file, None
+        try:
+            if target_keys is None:
+                target_keys = _lora_target_keys(model, clip)
+        except Exception as e:
+            log("warning", f"[IndexedLoRALoader Warning] Could not build the model key map ({e}). Loading the full LoRA file.")
+            return _load_lora_file, None
+        return functools.partial(_load_lora_file_matching, target_keys=target_keys), ("model_keys", hash(target_keys))
     
+    def _get_prefetch_indices(self, prefetch_mode, prefetch_slots, index, number_of_loras):
+        """Slot indices to prefetch after loading 'index'."""
+        if prefetch_mode == "next":
+            return [index + 1] if index + 1 <= number_of_loras else []
+        indices = []
+        for part in (prefetch_slots or "").split(","):
+            part = part.strip()
+            if not part:
+                continue
+            try:
+                slot = int(part)
+            except ValueError:
+                log("warning", f"[IndexedLoRALoader Warning] Ignoring invalid prefetch slot '{part}'.")
+                continue
+            if 1 <= slot <= number_of_loras and slot != index and slot not in indices:
+                indices.append(slot)
+        return indices
+
+    def _prefetch_slots(self, indices, slot_values, load_mode, model, clip):
+        target_keys = None
+        for slot in indices:
+            lora_name = slot_values.get(f"lora_{slot}")
+            if not lora_name or lora_name.lower() == "none":
+                continue
+            lora_path = get_full_path("loras", lora_name)
+            if not lora_path:
+                continue
+            if load_mode == "model_keys_only" and target_keys is None:
+                try:
+                    target_keys = _lora_target_keys(model, clip)
+                except Exception:
+                    load_mode = "full"
+            loader, variant = self._get_loader(load_mode, lora_path, model, clip, target_keys)
+            if LORA_CACHE.prefetch(lora_path, loader, variant):
+                log("info", f"[IndexedLoRALoader] Info: Prefetching LoRA slot {slot} ('{lora_name}') in the background.")
+
     # Add 'suffix_pattern' to the method signature
     def _extract_trigger_word(self, lora_filename_from_widget, suffix_pattern="_lora"):
         """
@@ -89,7 +762,7 @@ class IndexedLoRALoader:
                 name_without_ext = os.path.splitext(base_filename)[0]
                 return name_without_ext.strip()
             except Exception as e:
-                print(f"[IndexedLoRALoader Warning] Error processing filename '{lora_filename_from_widget}' with empty suffix: {str(e)}")
+                log("warning", f"[IndexedLoRALoader Warning] Error processing filename '{lora_filename_from_widget}' with empty suffix: {str(e)}")
                 return ""
 
         try:
@@ -116,9 +789,37 @@ class IndexedLoRALoader:
             return trigger_part.strip()
             
         except Exception as e:
-            print(f"[IndexedLoRALoader Warning] Error extracting trigger word from '{lora_filename_from_widget}' using suffix '{suffix_pattern}': {str(e)}")
+            log("warning", f"[IndexedLoRALoader Warning] Error extracting trigger word from '{lora_filename_from_widget}' using suffix '{suffix_pattern}': {str(e)}")
             return ""
 
+def _get_lora_names():
+    try:
+        return LORA_INDEX.get_names()
+    except Exception as e:
+        log("warning", f"[IndexedLoRALoader Warning] LoRA index refresh failed: {e}. Falling back to folder_paths.")
+        try:
+            return ["none"] + get_filename_list("loras")
+        except Exception as e:
+            log("warning", f"[IndexedLoRALoader Warning] Could not fetch LoRA list: {e}. Defaulting to ['none'].")
+            return ["none"]
+
+
+try:
+    import asyncio
+    from aiohttp import web
+    from server import PromptServer
+
+    @PromptServer.instance.routes.get("/beta_helpernodes/loras")
+    async def get_lora_list(request):
+        # Directory stats may be slow on network shares; keep them off the event loop
+        names = await asyncio.get_running_loop().run_in_executor(None, _get_lora_names)
+        etag = f'"{LORA_INDEX.version}"'
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304, headers={"ETag": etag})
+        return web.json_response({"loras": names}, headers={"ETag": etag})
+except Exception as e:
+    log("warning", f"[IndexedLoRALoader Warning] Could not register the LoRA list route: {e}")
+
 NODE_CLASS_MAPPINGS = {
     "IndexedLoRALoader_BETA": IndexedLoRALoader
 }
@@ -0,0 +1,214 @@
+"""
+Per-node profiling and log-level switch shared by all BETA nodes.
+
+Every registered node's FUNCTION is wrapped (see instrument_node) to record wall
+time, frames/s, bytes in/out, peak RSS growth and CUDA peak allocation of each call
+(the largest call is kept per node). The RSS peak is measured by resetting the
+kernel's high-water mark before the call, so it is Linux only. Nodes can time
+sub-steps with `with phase("encode"):`. The summary is available from
+get_profile_summary() and the GET /beta_helpernodes/profile route (?reset=1 clears it).
+
+Verbosity is set with the BETA_HELPERNODES_LOG_LEVEL environment variable:
+error, warning, info (default) or debug. At debug level each node execution is
+logged with its measurements.
+"""
+import os
+import time
+import threading
+import functools
+from contextlib import contextmanager
+
+import torch
+
+LOG_LEVELS = {"error": 40, "warning": 30, "info": 20, "debug": 10}
+LOG_LEVEL = LOG_LEVELS.get(os.environ.get("BETA_HELPERNODES_LOG_LEVEL", "info").strip().lower(), LOG_LEVELS["info"])
+
+
+def log_enabled(level):
+    return LOG_LEVELS[level] >= LOG_LEVEL
+
+
+def log(level, message):
+    """print() gated by BETA_HELPERNODES_LOG_LEVEL."""
+    if LOG_LEVELS[level] >= LOG_LEVEL:
+        print(message)
+
+
+def _current_rss_bytes():
+    """Current resident set size from /proc (None where /proc is unavailable)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def _reset_peak_rss():
+    """Resets the kernel's RSS high-water mark (VmHWM) so it covers a single call. Linux only."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def _peak_rss_bytes():
+    """RSS high-water mark since the last _reset_peak_rss() (None where unavailable)."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024 # kB
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def _payload_stats(value, depth=0):
+    """(bytes, frames) of the tensors/arrays in a node input or output value."""
+    if depth > 3 or value is None:
+        return 0, 0
+    if isinstance(value, torch.Tensor):
+        # IMAGE batches [B, H, W, C]: frames are the leading dimension (AUDIO is 3D, not counted)
+        return value.element_size() * value.nelement(), value.shape[0] if value.ndim == 4 else 0
+    if hasattr(value, "nbytes") and hasattr(value, "shape"): # numpy
+        return int(value.nbytes), 0
+    if isinstance(value, (str, bytes)):
+        return len(value), 0
+    if isinstance(value, dict):
+        values = value.values()
+    elif isinstance(value, (list, tuple)):
+        values = value
+    else:
+        return 0, 0
+    total_bytes = total_frames = 0
+    for item in values:
+        item_bytes, item_frames = _payload_stats(item, depth + 1)
+        total_bytes += item_bytes
+        total_frames += item_frames
+    return total_bytes, total_frames
+
+
+class NodeProfiler:
+    """Aggregated measurements per node key and per 'node key/phase'."""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {}
+        self._local = threading.local()
+
+    def _add(self, key, wall, **values):
+        with self._lock:
+            entry = self._stats.setdefault(key, {"calls": 0, "errors": 0, "total_s": 0.0, "max_s": 0.0, "last_s": 0.0})
+            entry["calls"] += 1
+            entry["total_s"] += wall
+            entry["max_s"] = max(entry["max_s"], wall)
+            entry["last_s"] = wall
+            for name, value in values.items():
+                if value is None:
+                    continue
+                if name.startswith("peak_"):
+                    entry[name] = max(entry.get(name, 0), value)
+                elif name == "error":
+                    entry["errors"] += int(value)
+                else:
+                    entry[name] = entry.get(name, 0) + value
+
+    def run(self, node_key, fn, args, kwargs):
+        """Calls fn(*args, **kwargs) and records it under node_key."""
+        bytes_in, frames_in = _payload_stats(kwargs)
+        rss_before = _current_rss_bytes()
+        rss_reset = rss_before is not None and _reset_peak_rss()
+        cuda = torch.cuda.is_available() and torch.cuda.is_initialized()
+        if cuda:
+            torch.cuda.reset_peak_memory_stats()
+        parent = getattr(self._local, "node_key", None)
+        self._local.node_key = node_key
+        start = time.perf_counter()
+        result = None
+        failed = True
+        try:
+            result = fn(*args, **kwargs)
+            failed = False
+            return result
+        finally:
+            wall = time.perf_counter() - start
+            self._local.node_key = parent
+            bytes_out, _ = _payload_stats(result.get("result") if isinstance(result, dict) else result)
+            peak_cuda = torch.cuda.max_memory_allocated() if cuda else None
+            # Peak RSS during this call above the RSS at its start, i.e. what the node itself allocated
+            peak_rss = _peak_rss_bytes() if rss_reset else None
+            peak_rss_growth = max(0, peak_rss - rss_before) if peak_rss is not None else None
+            self._add(node_key, wall, error=failed, frames=frames_in, bytes_in=bytes_in, bytes_out=bytes_out,
+                      peak_rss_growth_bytes=peak_rss_growth, peak_cuda_bytes=peak_cuda)
+            if log_enabled("debug"):
+                fps = f", {frames_in / wall:.1f} frames/s" if frames_in and wall > 0 else ""
+                rss_info = f", RSS +{peak_rss_growth / 2**20:.0f} MB" if peak_rss_growth is not None else ""
+                cuda_info = f", CUDA peak {peak_cuda / 2**20:.0f} MB" if peak_cuda is not None else ""
+                print(f"[BETA profile] {node_key}: {wall * 1000:.1f} ms{fps}, in {bytes_in / 2**20:.1f} MB, "
+                      f"out {bytes_out / 2**20:.1f} MB{rss_info}{cuda_info}{' (failed)' if failed else ''}")
+
+    @contextmanager
+    def phase(self, name, frames=0):
+        """Times a sub-step of the node currently executing on this thread."""
+        node_key = getattr(self._local, "node_key", None) or "unknown"
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - start
+            self._add(f"{node_key}/{name}", wall, frames=frames or None)
+            log("debug", f"[BETA profile] {node_key}/{name}: {wall * 1000:.1f} ms")
+
+    def summary(self):
+        with self._lock:
+            summary = {}
+            for key, entry in self._stats.items():
+                entry = dict(entry)
+                entry["mean_s"] = entry["total_s"] / entry["calls"] if entry["calls"] else 0.0
+                if entry.get("frames") and entry["total_s"] > 0:
+                    entry["frames_per_s"] = entry["frames"] / entry["total_s"]
+                summary[key] = entry
+            return summary
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+
+PROFILER = NodeProfiler()
+phase = PROFILER.phase
+
+
+def get_profile_summary():
+    return PROFILER.summary()
+
+
+def instrument_node(node_key, node_class):
+    """Wraps node_class's FUNCTION so every execution is recorded under node_key."""
+    function_name = getattr(node_class, "FUNCTION", None)
+    fn = getattr(node_class, function_name, None) if function_name else None
+    if fn is None or getattr(fn, "_beta_instrumented", False):
+        return node_class
+
+    @functools.wraps(fn)
+    def instrumented(*args, **kwargs):
+        return PROFILER.run(node_key, fn, args, kwargs)
+
+    instrumented._beta_instrumented = True
+    setattr(node_class, function_name, instrumented)
+    return node_class
+
+
+try:
+    from aiohttp import web
+    from server import PromptServer
+
+    @PromptServer.instance.routes.get("/beta_helpernodes/profile")
+    async def get_profile(request):
+        summary = PROFILER.summary()
+        if request.query.get("reset") in ("1", "true"):
+            PROFILER.reset()
+        return web.json_response({"log_level": next(n for n, v in LOG_LEVELS.items() if v == LOG_LEVEL), "nodes": summary})
+except Exception as e:
+    log("debug", f"[ComfyUI-BETA-Helpernodes] Profile route not registered: {e}")
@@ -1,9 +1,36 @@
 import { app } from "../../../scripts/app.js";
+import { api } from "../../../scripts/api.js";
 
 console.log("[BETA Helper Nodes] betaHelperNodes.js (v_add_remove_resize) script loaded.");
 
+// The LoRA list is served once by the Python side (/beta_helpernodes/loras)
+// instead of being repeated in all 20 slot definitions of /object_info.
+// It is fetched once per page load and shared by every Indexed LoRA Loader node.
+let loraListPromise = null;
+
+function fetchLoraList(force = false) {
+    if (!loraListPromise || force) {
+        loraListPromise = api.fetchApi("/beta_helpernodes/loras")
+            .then((response) => response.json())
+            .then((data) => (Array.isArray(data.loras) && data.loras.length ? data.loras : ["none"]))
+            .catch((error) => {
+                console.error("[BETA Helper Nodes] Could not fetch the LoRA list:", error);
+                loraListPromise = null; // Retry on the next request
+                return ["none"];
+            });
+    }
+    return loraListPromise;
+}
+
 app.registerExtension({
     name: "Comfy.BETAHelperNodes.IndexedLoraLoaderLogic",
+    async refreshComboInNodes() {
+        // Pick up added/removed LoRA files when the user refreshes node definitions
+        await fetchLoraList(true);
+        for (const node of app.graph?._nodes || []) {
+            if (node.betaUpdateDynamicWidgets) node.betaUpdateDynamicWidgets();
+        }
+    },
     async nodeCreated(node) {
         const expectedNodeTitle = "Indexed LoRA Loader 🎯 🅑🅔🅣🅐"; // Ensure this matches your node's display name
 
@@ -14,7 +41,16 @@ app.registerExtension({
                 node.properties = {};
             }
 
-            const updateDynamicWidgets = () => {
+            // Widget defaults, captured before a saved workflow overwrites them
+            const widgetDefaults = Object.fromEntries(node.widgets.map(w => [w.name, w.value]));
+            // Required widgets present since the first release; in workflows saved before
+            // the cache/prefetch/stack options existed, lora_1.. follow them directly
+            const LEGACY_STATIC_WIDGETS = ["number_of_loras", "index", "strength_model", "strength_clip", "trigger_suffix"];
+
+            const updateDynamicWidgets = async () => {
+                // Resolve the shared LoRA list first so widgets are never left half-rebuilt
+                const loraOptionsList = await fetchLoraList();
+
                 const numLorasWidget = node.widgets.find(w => w.name === "number_of_loras");
                 if (!numLorasWidget) {
                     console.error("[BETA Helper Nodes] 'number_of_loras' widget not found!");
@@ -41,53 +77,20 @@ app.registerExtension({
                 const staticWidgets = node.widgets.filter(w => !w.name.startsWith("lora_"));
                 node.widgets = [...staticWidgets];
 
-                let loraOptionsList = ["none"];
-                const firstLoraWidgetInProperties = node.properties["lora_1"]; // Check if a value was saved
-                // Try to get options from a previously existing lora_1 if its definition is in node.widgets_values
-                // This part is heuristic as JS doesn't re-run Python INPUT_TYPES.
-                // If you have access to the original widget definition somehow, that's better.
-                if (node.widgets_values && node.widgets_values["lora_1"] && Array.isArray(node.widgets_values["lora_1"])) {
-                    // This case is unlikely; widgets_values usually stores the *selected value*, not the options list.
-                    // loraOptionsList = node.widgets_values["lora_1"];
-                } else {
-                    // Fallback: Check if the Python side somehow made options available on the node object
-                    // or if we can find a template widget that defines them.
-                    // This is often the hardest part for fully dynamic JS widgets if options are defined in Python.
-                    // For now, we assume 'none' or a fixed list if not inferable.
-                    // A common pattern is to have a hidden widget or property that stores the original options list.
-                }
-                // If your LoRA list is populated from folder_paths.get_filename_list("loras") in Python,
-                // that list isn't directly available here. The options for the *combo* widget are set
-                // when node.addWidget is called. If it's the first time, we need a source for `loraOptionsList`.
-                // If `lora_X` widgets are defined in `optional_inputs` in Python, their initial options
-                // are set there. We need to preserve/reuse those.
-                // Let's assume for now `loraOptionsList` should be derived from the node's initial config if possible
-                // or a fixed default. The Bjornulf code did:
-                // const loraList = node.widgets.find(w => w.name === "lora_1")?.options?.values || [];
-                // This implies lora_1 must exist or have existed to get its options.
-                // We can try:
-                const anExistingLoraWidgetBeforeRemoval = node.constructor.nodeData?.widgets?.find(w => w.name === "lora_1"); // Check original node data
-                if(anExistingLoraWidgetBeforeRemoval && anExistingLoraWidgetBeforeRemoval.options && anExistingLoraWidgetBeforeRemoval.options.values) {
-                    loraOptionsList = anExistingLoraWidgetBeforeRemoval.options.values;
-                } else if (node.widgets_values && typeof node.widgets_values.lora_1_options !== "undefined") {
-                    // A convention could be to save options in widgets_values if they are dynamic.
-                     loraOptionsList = node.widgets_values.lora_1_options;
-                }
-                // If still no list, use a hardcoded default or ensure Python provides it.
-                // For now, it might default to just ["none"] if no other source is found by this logic.
-
-
                 for (let i = 1; i <= numLoras; i++) {
                     const loraWidgetName = `lora_${i}`;
                     const savedValue = node.properties[loraWidgetName];
-                    const defaultValue = loraOptionsList.includes(savedValue) ? savedValue : loraOptionsList[0] || "none";
+                    const defaultValue = savedValue || loraOptionsList[0] || "none";
+                    // Keep a saved selection visible even if the file is currently missing,
+                    // so loading a workflow never silently resets a slot to 'none'
+                    const values = loraOptionsList.includes(defaultValue) ? loraOptionsList : [...loraOptionsList, defaultValue];
 
                     node.addWidget(
                         "combo",
                         loraWidgetName,
                         defaultValue,
                         (value) => { node.properties[loraWidgetName] = value; },
-                        { values: loraOptionsList }
+                        { values }
                     );
                 }
 
@@ -128,39 +131,55 @@ app.registerExtension({
                 };
             }
 
+            // widgets_values is restored by position, which breaks whenever inputs are
+            // added. Also save the values by name and restore from those when present.
+            const onNodeSerialize = node.onSerialize;
+            node.onSerialize = function(info) {
+                if (onNodeSerialize) onNodeSerialize.apply(this, arguments);
+                info.beta_widget_values = Object.fromEntries(this.widgets.map(w => [w.name, w.value]));
+            };
+
             const onNodeConfigure = node.onConfigure;
             node.onConfigure = function(info) {
                 if (onNodeConfigure) onNodeConfigure.apply(this, arguments);
                 if (!this.properties) this.properties = {}; // Ensure properties exists
 
-                if (info.widgets_values) {
+                let valuesByName = info.beta_widget_values;
+                const values = info.widgets_values;
+                if (!valuesByName && Array.isArray(values)) {
+                    valuesByName = {};
+                    const legacy = typeof values[LEGACY_STATIC_WIDGETS.length] === "string";
+                    if (legacy) {
+                        // Pre-cache/prefetch layout: statics, then the slots. The newer
+                        // widgets got slot values by position; put their defaults back.
+                        LEGACY_STATIC_WIDGETS.forEach((name, i) => { valuesByName[name] = values[i]; });
+                        values.slice(LEGACY_STATIC_WIDGETS.length).forEach((value, i) => { valuesByName[`lora_${i + 1}`] = value; });
+                        for (const [name, value] of Object.entries(widgetDefaults)) {
+                            if (!(name in valuesByName)) valuesByName[name] = value;
+                        }
+                    } else {
+                        // Same layout as the current widgets (statics first, then the slots)
+                        this.widgets.forEach((w, i) => { if (i < values.length) valuesByName[w.name] = values[i]; });
+                    }
+                }
+                if (valuesByName) {
+                    for (const w of this.widgets) {
+                        if (w.name in valuesByName && !w.name.startsWith("lora_")) w.value = valuesByName[w.name];
+                    }
                     for (let i = 1; i <= 20; i++) {
                         const loraWidgetName = `lora_${i}`;
-                        if (info.widgets_values[loraWidgetName] !== undefined) {
-                            this.properties[loraWidgetName] = info.widgets_values[loraWidgetName];
+                        if (valuesByName[loraWidgetName] !== undefined) {
+                            this.properties[loraWidgetName] = valuesByName[loraWidgetName];
+                            const loraWidget = this.widgets.find(w => w.name === loraWidgetName);
+                            if (loraWidget) loraWidget.value = valuesByName[loraWidgetName];
                         }
                     }
-                     // If lora options were saved, restore them
-                    if (typeof info.widgets_values.lora_1_options !== "undefined") {
-                        this.widgets_values.lora_1_options = info.widgets_values.lora_1_options;
-                    }
                 }
                 setTimeout(updateDynamicWidgets, 50);
             };
-            
-            // To ensure loraOptionsList is available when the node is first created or loaded
-            // we might need to extract it from INPUT_TYPES definition if possible, or have Python save it.
-            // One way: Python adds a hidden widget or property with the LoRA list.
-            // For now, make a placeholder for how Python might provide this:
-            if (!node.widgets_values) node.widgets_values = {};
-            if (node.widgets && node.widgets.find(w=>w.name==="lora_1") && node.widgets.find(w=>w.name==="lora_1").options.values) {
-                 node.widgets_values.lora_1_options = node.widgets.find(w=>w.name==="lora_1").options.values;
-            } else {
-                // Attempt to get it from the class's default widget definitions if available
-                // This part is highly dependent on how ComfyUI stores original widget definitions accessible to JS
-                // For now, if it's not found, loraOptionsList will default to ["none"] inside updateDynamicWidgets.
-            }
 
+            // Lets refreshComboInNodes rebuild the slot combos after the LoRA list changes
+            node.betaUpdateDynamicWidgets = updateDynamicWidgets;
 
             setTimeout(updateDynamicWidgets, 100);
         }
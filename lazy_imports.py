@@ -0,0 +1,49 @@
+"""
+Deferred imports for heavy dependencies (cv2, scenedetect, torchaudio, comfy.sd, ...).
+lazy_module("cv2") returns a stand-in that imports the real module on first attribute
+access, so node classes can be registered at startup without paying for their imports.
+"""
+import functools
+import importlib
+import importlib.util
+import threading
+import types
+
+_IMPORT_LOCK = threading.RLock()
+
+
+class LazyModule(types.ModuleType):
+    """Module proxy that imports 'name' when one of its attributes is first used."""
+    def __init__(self, name):
+        super().__init__(name)
+        self.__dict__["_lazy_target"] = None
+
+    def _load(self):
+        module = self.__dict__["_lazy_target"]
+        if module is None:
+            with _IMPORT_LOCK:
+                module = self.__dict__["_lazy_target"]
+                if module is None:
+                    module = importlib.import_module(self.__name__)
+                    self.__dict__["_lazy_target"] = module
+        return module
+
+    def __getattr__(self, attr):
+        # Only called for attributes the proxy itself doesn't have
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+
+def lazy_module(name):
+    return LazyModule(name)
+
+
+@functools.lru_cache(maxsize=None)
+def is_available(name):
+    """Whether 'name' can be imported, checked without importing it (parent packages may be imported)."""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
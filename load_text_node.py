@@ -1,4 +1,274 @@
 import os
+import json
+import mmap
+import tarfile
+import zipfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from .instrumentation import log
+
+
+class TextDirectoryIndex:
+    """
+    Process-wide cache of the sorted '.txt' file names in a directory, optionally
+    including all subdirectories (names are then relative paths using '/').
+    Each directory's listing is cached with its mtime and re-read only when that
+    mtime changes (a file was added, removed or renamed directly inside it), and
+    each filter's sorted subset is cached alongside the combined listing, so
+    repeated lookups cost one stat per directory.
+    """
+    def __init__(self):
+        self._dirs = {} # real dir path -> (mtime_ns, [txt file names], [subdir names])
+        self._listings = {} # (real root path, recursive) -> {"dirs": {path: mtime}, "files": [...], "filtered": {filter: [...]}}
+        self._lock = threading.Lock()
+
+    def get_files(self, directory_path, filename_filter="", recursive=False):
+        real_path = os.path.realpath(directory_path)
+        filter_key = (filename_filter or "").lower()
+        with self._lock:
+            dir_mtimes = self._refresh(real_path, recursive)
+            listing = self._listings.get((real_path, recursive))
+            if listing is None or listing["dirs"] != dir_mtimes:
+                listing = {"dirs": dir_mtimes, "files": self._combine(real_path, dir_mtimes), "filtered": {}}
+                self._listings[(real_path, recursive)] = listing
+            files = listing["files"]
+            if not filter_key:
+                return files
+            filtered = listing["filtered"].get(filter_key)
+            if filtered is None:
+                filtered = [f for f in files if filter_key in f.lower()]
+                listing["filtered"][filter_key] = filtered
+            return filtered
+
+    def clear(self):
+        with self._lock:
+            self._dirs.clear()
+            self._listings.clear()
+
+    def _refresh(self, root, recursive):
+        """Stat 'root' (and its subdirectories if recursive), re-listing changed ones. Returns {dir: mtime}."""
+        dir_mtimes = {}
+        pending = [root]
+        while pending:
+            directory = pending.pop()
+            if directory in dir_mtimes:
+                continue
+            try:
+                mtime_ns = os.stat(directory).st_mtime_ns
+            except OSError:
+                if directory == root:
+                    raise
+                continue
+            cached = self._dirs.get(directory)
+            if cached is None or cached[0] != mtime_ns:
+                cached = (mtime_ns,) + self._scan(directory)
+                self._dirs[directory] = cached
+            dir_mtimes[directory] = mtime_ns
+            if recursive:
+                pending.extend(os.path.join(directory, name) for name in cached[2])
+        return dir_mtimes
+
+    def _combine(self, root, dir_mtimes):
+        files = []
+        for directory in dir_mtimes:
+            relative_dir = os.path.relpath(directory, root).replace(os.sep, '/')
+            prefix = '' if relative_dir == '.' else relative_dir + '/'
+            files.extend(prefix + name for name in self._dirs[directory][1])
+        return sorted(files)
+
+    @staticmethod
+    def _scan(directory_path):
+        # scandir's is_file()/is_dir() use the directory entry type and avoid a stat per file on most filesystems
+        files = []
+        subdirs = []
+        with os.scandir(directory_path) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir():
+                        if not entry.name.startswith('.'):
+                            subdirs.append(entry.name)
+                    elif entry.name.lower().endswith('.txt') and entry.is_file():
+                        files.append(entry.name)
+                except OSError:
+                    continue
+        return files, subdirs
+
+
+TEXT_DIRECTORY_INDEX = TextDirectoryIndex()
+
+_ZIP_EXTENSIONS = ('.zip',)
+_TAR_EXTENSIONS = ('.tar', '.tar.gz', '.tgz', '.tar.bz2', '.tbz2', '.tar.xz', '.txz')
+
+
+def _is_text_archive(path):
+    return path.lower().endswith(_ZIP_EXTENSIONS + _TAR_EXTENSIONS) and os.path.isfile(path)
+
+
+class TextArchiveIndex:
+    """
+    Process-wide cache of the '.txt' members of zip/tar archives.
+    The member list is built once per archive version (mtime and size) from the
+    zip central directory or the tar headers. A selected member is streamed
+    straight out of the archive without extracting anything else: zip members
+    through a cached ZipFile, uncompressed tar members by seeking to their
+    data offset. Batches from compressed tars are read in one streaming pass.
+    At most _MAX_OPEN_ZIPFILES zip handles stay open; the least recently used
+    idle ones are closed and reopened on their next read.
+    """
+    _MAX_OPEN_ZIPFILES = 8
+
+    def __init__(self):
+        self._entries = {} # real archive path -> entry dict
+        self._open_zips = OrderedDict() # real archive path -> entry with an open ZipFile, least recently used first
+        self._lock = threading.Lock()
+
+    def get_members(self, archive_path, filename_filter=""):
+        entry = self._get_entry(archive_path)
+        filter_key = (filename_filter or "").lower()
+        if not filter_key:
+            return entry["names"]
+        with self._lock:
+            filtered = entry["filtered"].get(filter_key)
+            if filtered is None:
+                filtered = [name for name in entry["names"] if filter_key in name.lower()]
+                entry["filtered"][filter_key] = filtered
+            return filtered
+
+    def read_member(self, archive_path, member_name):
+        return self.read_members(archive_path, [member_name])[member_name].decode('utf-8')
+
+    def read_members(self, archive_path, member_names):
+        """Raw bytes of the given members as {name: data}, reading the archive once."""
+        entry = self._get_entry(archive_path)
+        members = [entry["members"][name] for name in member_names]
+        data = {}
+        if entry["kind"] == "zip":
+            archive = self._acquire_zip(entry)
+            try:
+                for member in members:
+                    with archive.open(member) as f:
+                        data[member.filename] = f.read()
+            finally:
+                self._release_zip(entry)
+        elif entry["seekable"]:
+            with open(entry["path"], 'rb') as f:
+                for member in sorted(members, key=lambda m: m.offset_data):
+                    f.seek(member.offset_data)
+                    data[member.name] = f.read(member.size)
+        else:
+            # Compressed tars have no random access: one sequential pass that stops
+            # after the last wanted member, instead of decompressing from the start per member
+            wanted = {member.offset: member.name for member in members}
+            with tarfile.open(entry["path"], 'r|*') as tar:
+                for info in tar:
+                    name = wanted.pop(info.offset, None)
+                    if name is not None:
+                        data[name] = tar.extractfile(info).read()
+                        if not wanted:
+                            break
+        return data
+
+    def _acquire_zip(self, entry):
+        with self._lock:
+            if entry["zipfile"] is None:
+                entry["zipfile"] = zipfile.ZipFile(entry["path"])
+            entry["users"] += 1
+            self._open_zips[entry["path"]] = entry
+            self._open_zips.move_to_end(entry["path"])
+            self._close_idle_zips()
+            return entry["zipfile"]
+
+    def _release_zip(self, entry):
+        with self._lock:
+            entry["users"] -= 1
+            if self._open_zips.get(entry["path"]) is not entry and entry["users"] == 0 and entry["zipfile"] is not None:
+                # Replaced by a newer version of the archive while it was being read
+                entry["zipfile"].close()
+                entry["zipfile"] = None
+            self._close_idle_zips()
+
+    def _close_idle_zips(self):
+        """Closes least recently used idle zip handles beyond the limit. Caller holds the lock."""
+        for path, entry in list(self._open_zips.items()):
+            if len(self._open_zips) <= self._MAX_OPEN_ZIPFILES:
+                break
+            if entry["users"] == 0:
+                entry["zipfile"].close()
+                entry["zipfile"] = None
+                del self._open_zips[path]
+
+    def _get_entry(self, archive_path):
+        real_path = os.path.realpath(archive_path)
+        st = os.stat(real_path)
+        with self._lock:
+            entry = self._entries.get(real_path)
+            if entry is not None and entry["version"] == (st.st_mtime_ns, st.st_size):
+                return entry
+            if entry is not None and self._open_zips.get(real_path) is entry:
+                del self._open_zips[real_path]
+                if entry["users"] == 0:
+                    entry["zipfile"].close()
+                    entry["zipfile"] = None
+            entry = self._build(real_path)
+            entry["version"] = (st.st_mtime_ns, st.st_size)
+            self._entries[real_path] = entry
+            if entry["zipfile"] is not None:
+                self._open_zips[real_path] = entry
+                self._close_idle_zips()
+            return entry
+
+    @staticmethod
+    def _build(real_path):
+        entry = {"path": real_path, "filtered": {}, "zipfile": None, "users": 0, "seekable": True}
+        if real_path.lower().endswith(_ZIP_EXTENSIONS):
+            archive = zipfile.ZipFile(real_path)
+            members = {info.filename: info for info in archive.infolist()
+                       if not info.is_dir() and info.filename.lower().endswith('.txt')}
+            entry.update(kind="zip", zipfile=archive)
+        else:
+            with tarfile.open(real_path, 'r:*') as tar:
+                members = {info.name: info for info in tar.getmembers()
+                           if info.isfile() and info.name.lower().endswith('.txt')}
+            entry.update(kind="tar", seekable=real_path.lower().endswith('.tar'))
+        entry["members"] = members
+        entry["names"] = sorted(members)
+        return entry
+
+
+TEXT_ARCHIVE_INDEX = TextArchiveIndex()
+
+
+def _list_text_source(source_path, filename_filter="", recursive=False):
+    """Sorted '.txt' entry names of a directory (optionally recursive) or a zip/tar archive."""
+    if _is_text_archive(source_path):
+        return TEXT_ARCHIVE_INDEX.get_members(source_path, filename_filter)
+    return TEXT_DIRECTORY_INDEX.get_files(source_path, filename_filter, recursive)
+
+
+def _read_text_entry(source_path, name):
+    if _is_text_archive(source_path):
+        return TEXT_ARCHIVE_INDEX.read_member(source_path, name)
+    with open(os.path.join(source_path, name), 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def _is_valid_text_source(source_path):
+    return bool(source_path) and (os.path.isdir(source_path) or _is_text_archive(source_path))
+
+
+def _stat_fingerprint(*paths):
+    """Change fingerprint from size and mtime of the given paths, without reading contents."""
+    parts = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+            parts.append(f"{path}:{st.st_size}:{st.st_mtime_ns}")
+        except OSError:
+            parts.append(f"{path}:missing")
+    return "|".join(parts)
+
 
 class LoadTextFromIndex:
     """
@@ -17,6 +287,7 @@ class LoadTextFromIndex:
         },
         "optional": {
              "filename_filter": ("STRING", {"multiline": False, "default": ""}),
+             "recursive": ("BOOLEAN", {"default": False, "tooltip": "Include .txt files in subdirectories (names become relative paths). Zip/tar archives given as directory_path are always searched completely."}),
         }
       }
 
@@ -25,44 +296,325 @@ class LoadTextFromIndex:
     FUNCTION = "load_file"
     CATEGORY = "BETA Nodes"
 
-    def load_file(self, directory_path, file_index, filename_filter = ""):
+    @classmethod
+    def IS_CHANGED(cls, directory_path = "", file_index = None, filename_filter = "", recursive = False, **kwargs):
+      # Directory mtime covers added/removed files, the selected file's size/mtime covers edits.
+      # Archives are covered by their own size/mtime. Linked inputs are not passed to IS_CHANGED,
+      # so a linked file_index gets the directory-only fingerprint (its value is hashed by ComfyUI).
+      try:
+          if file_index is None or _is_text_archive(directory_path):
+              return _stat_fingerprint(directory_path)
+          txt_files = TEXT_DIRECTORY_INDEX.get_files(directory_path, filename_filter, recursive)
+          selected = [os.path.join(directory_path, txt_files[file_index])] if 0 <= file_index < len(txt_files) else []
+          return _stat_fingerprint(directory_path, *selected)
+      except Exception:
+          return _stat_fingerprint(directory_path)
+
+    def load_file(self, directory_path, file_index, filename_filter = "", recursive = False):
       selected_filename = "N/A"
-      full_file_path = "N/A"
-      if not directory_path or not os.path.isdir(directory_path):
-        print(f"Warning: Directory path '{directory_path}' is invalid or not found.")
+      if not _is_valid_text_source(directory_path):
+        log("warning", f"Warning: Directory path '{directory_path}' is invalid or not found.")
         return ("", "N/A")
-      print(f"Scanning directory: {directory_path} with filter: '{filename_filter}'")
       try:
-          all_files = [f for f in os.listdir(directory_path)
-                        if os.path.isfile(os.path.join(directory_path, f))]
-          txt_files = sorted([f for f in all_files if f.lower().endswith('.txt') and (filename_filter.lower() in f.lower() if filename_filter else True)])
+          txt_files = _list_text_source(directory_path, filename_filter, recursive)
       except Exception as e:
-          print(f"Error listing files in directory '{directory_path}': {e}")
+          log("error", f"Error listing files in directory '{directory_path}': {e}")
           return ("", "N/A")
       
       if not txt_files:
-          print(f"Warning: No '.txt' files found in '{directory_path}'" + (f" matching filter '{filename_filter}'." if filename_filter else "."))
+          log("warning", f"Warning: No '.txt' files found in '{directory_path}'" + (f" matching filter '{filename_filter}'." if filename_filter else "."))
           return ("", "N/A")
       num_files = len(txt_files)
       if file_index >= num_files or file_index < 0:
-        print(f"Warning: file index {file_index} out of range, it needs to be between 0 and {num_files-1} ")
+        log("warning", f"Warning: file index {file_index} out of range, it needs to be between 0 and {num_files-1} ")
         return ("", "N/A")
       selected_filename = txt_files[file_index]
-      full_file_path = os.path.join(directory_path, selected_filename)
       
       try:
-          with open(full_file_path, 'r', encoding='utf-8') as f:
-              text_content = f.read()
-          print(f"Loaded text file ({file_index + 1}/{num_files}): {selected_filename}")
+          text_content = _read_text_entry(directory_path, selected_filename)
+          log("info", f"Loaded text file ({file_index + 1}/{num_files}): {selected_filename}")
           return (text_content, selected_filename)
       except Exception as e:
-          print(f"Error reading file '{full_file_path}': {e}")
+          log("error", f"Error reading file '{selected_filename}' from '{directory_path}': {e}")
           return ("", selected_filename)
-      
+
+
+class LoadTextBatchFromIndex:
+    """
+      Loads a range of text files (.txt) from a directory in one execution.
+      Selects files start, start+stride, ... (count files, 0 = until the end) from the
+      sorted list, reads them concurrently and outputs them as lists so one execution
+      can feed a whole batch.
+      """
+    def __init__(self):
+      pass
+
+    @classmethod
+    def INPUT_TYPES(cls):
+      return {
+          "required": {
+            "directory_path": ("STRING", {"multiline": False, "default": ""}),
+            "start_index": ("INT", {"default": 0, "min": 0, "step": 1}),
+            "count": ("INT", {"default": 0, "min": 0, "step": 1, "tooltip": "Number of files to load, 0 loads every selected file until the end"}),
+            "stride": ("INT", {"default": 1, "min": 1, "step": 1}),
+        },
+        "optional": {
+             "filename_filter": ("STRING", {"multiline": False, "default": ""}),
+             "max_workers": ("INT", {"default": 8, "min": 1, "max": 64, "step": 1}),
+             "recursive": ("BOOLEAN", {"default": False, "tooltip": "Include .txt files in subdirectories (names become relative paths). Zip/tar archives given as directory_path are always searched completely."}),
+        }
+      }
+
+    RETURN_TYPES = ("STRING", "STRING")
+    RETURN_NAMES = ("texts", "loaded_filenames")
+    OUTPUT_IS_LIST = (True, True)
+    FUNCTION = "load_files"
+    CATEGORY = "BETA Nodes"
+
+    @classmethod
+    def IS_CHANGED(cls, directory_path = "", start_index = None, count = None, stride = None, filename_filter = "", max_workers = 8, recursive = False, **kwargs):
+      # Linked (so unknown here) range inputs fall back to the directory-only fingerprint
+      try:
+          if None in (start_index, count, stride) or _is_text_archive(directory_path):
+              return _stat_fingerprint(directory_path)
+          txt_files = TEXT_DIRECTORY_INDEX.get_files(directory_path, filename_filter, recursive)
+          stop_index = len(txt_files) if count <= 0 else min(len(txt_files), start_index + count * stride)
+          selected = [os.path.join(directory_path, name) for name in txt_files[start_index:stop_index:stride]]
+          return _stat_fingerprint(directory_path, *selected)
+      except Exception:
+          return _stat_fingerprint(directory_path)
+
+    def load_files(self, directory_path, start_index, count, stride, filename_filter = "", max_workers = 8, recursive = False):
+      if not _is_valid_text_source(directory_path):
+        log("warning", f"Warning: Directory path '{directory_path}' is invalid or not found.")
+        return ([], [])
+      try:
+          txt_files = _list_text_source(directory_path, filename_filter, recursive)
+      except Exception as e:
+          log("error", f"Error listing files in directory '{directory_path}': {e}")
+          return ([], [])
+
+      if not txt_files:
+          log("warning", f"Warning: No '.txt' files found in '{directory_path}'" + (f" matching filter '{filename_filter}'." if filename_filter else "."))
+          return ([], [])
+      num_files = len(txt_files)
+      if start_index >= num_files:
+        log("warning", f"Warning: start index {start_index} out of range, it needs to be between 0 and {num_files-1} ")
+        return ([], [])
+      stop_index = num_files if count <= 0 else min(num_files, start_index + count * stride)
+      selected_filenames = txt_files[start_index:stop_index:stride]
+
+      texts = _read_text_files(directory_path, selected_filenames, max_workers)
+      log("info", f"Loaded {len(texts)} text files ({start_index + 1}-{start_index + (len(texts) - 1) * stride + 1}/{num_files}, stride {stride}) from '{directory_path}'")
+      return (texts, selected_filenames)
+
+
+def _read_text_file(source_path, name):
+    try:
+        return _read_text_entry(source_path, name)
+    except Exception as e:
+        log("error", f"Error reading file '{name}' from '{source_path}': {e}")
+        return ""
+
+
+def _read_text_files(source_path, names, max_workers=8):
+    """Texts of several entries in order; files are read concurrently, archive members in one pass."""
+    if not _is_text_archive(source_path):
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(names))) as executor:
+            return list(executor.map(lambda name: _read_text_file(source_path, name), names))
+    try:
+        data = TEXT_ARCHIVE_INDEX.read_members(source_path, names)
+    except Exception as e:
+        log("error", f"Error reading files from '{source_path}': {e}")
+        return [""] * len(names)
+    texts = []
+    for name in names:
+        try:
+            texts.append(data[name].decode('utf-8'))
+        except Exception as e:
+            log("error", f"Error reading file '{name}' from '{source_path}': {e}")
+            texts.append("")
+    return texts
+
+
+class RecordOffsetIndex:
+    """
+    Byte offsets of the records (non-empty lines) of large TXT/JSONL files.
+    The index is built once with a chunked, vectorized newline scan, kept in
+    memory per file mtime/size and saved to a '<file>.beta_lineidx.npz' sidecar
+    so later processes can reuse it. Fetching record N is then a single
+    memory-mapped slice, independent of the file size.
+    """
+    SCAN_CHUNK_BYTES = 16 * 1024 * 1024
+    SIDECAR_SUFFIX = ".beta_lineidx.npz"
+
+    def __init__(self):
+        self._entries = {} # real path -> (mtime_ns, size, starts, ends)
+        self._lock = threading.Lock()
+
+    def get_offsets(self, file_path, write_sidecar=True):
+        """(starts, ends) int64 arrays of record byte ranges (end exclusive, without the newline)."""
+        real_path = os.path.realpath(file_path)
+        st = os.stat(real_path)
+        with self._lock:
+            entry = self._entries.get(real_path)
+            if entry is not None and entry[0] == st.st_mtime_ns and entry[1] == st.st_size:
+                return entry[2], entry[3]
+            offsets = self._load_sidecar(real_path, st)
+            if offsets is None:
+                offsets = self._build(real_path, st.st_size)
+                log("info", f"Built record index for '{file_path}': {len(offsets[0])} records")
+                if write_sidecar:
+                    self._save_sidecar(real_path, st, offsets)
+            self._entries[real_path] = (st.st_mtime_ns, st.st_size) + offsets
+            return offsets
+
+    def read_record(self, file_path, record_index, write_sidecar=True):
+        starts, ends = self.get_offsets(file_path, write_sidecar)
+        start, end = int(starts[record_index]), int(ends[record_index])
+        with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            data = mm[start:end]
+        return data.decode('utf-8').rstrip('\r')
+
+    def _build(self, file_path, size):
+        newline_chunks = []
+        buffer = bytearray(self.SCAN_CHUNK_BYTES)
+        offset = 0
+        with open(file_path, 'rb') as f:
+            while True:
+                n = f.readinto(buffer)
+                if not n:
+                    break
+                chunk = np.frombuffer(buffer, dtype=np.uint8, count=n)
+                newline_chunks.append(np.flatnonzero(chunk == 0x0A).astype(np.int64) + offset)
+                offset += n
+        newlines = np.concatenate(newline_chunks) if newline_chunks else np.empty(0, dtype=np.int64)
+        starts = np.concatenate((np.zeros(1, dtype=np.int64), newlines + 1))
+        ends = np.concatenate((newlines, np.array([size], dtype=np.int64)))
+        keep = ends > starts
+        # A lone '\r' is a blank line of a CRLF file
+        single_byte = np.flatnonzero(ends - starts == 1)
+        if len(single_byte):
+            with open(file_path, 'rb') as f:
+                for i in single_byte:
+                    f.seek(int(starts[i]))
+                    if f.read(1) == b'\r':
+                        keep[i] = False
+        return starts[keep], ends[keep]
+
+    def _load_sidecar(self, file_path, st):
+        sidecar_path = file_path + self.SIDECAR_SUFFIX
+        if not os.path.isfile(sidecar_path):
+            return None
+        try:
+            with np.load(sidecar_path) as data:
+                if int(data["source_size"]) != st.st_size or int(data["source_mtime_ns"]) != st.st_mtime_ns:
+                    return None
+                return data["starts"], data["ends"]
+        except Exception as e:
+            log("warning", f"Warning: Ignoring unreadable record index '{sidecar_path}': {e}")
+            return None
+
+    def _save_sidecar(self, file_path, st, offsets):
+        sidecar_path = file_path + self.SIDECAR_SUFFIX
+        temp_path = sidecar_path + ".tmp"
+        try:
+            with open(temp_path, 'wb') as f:
+                np.savez(f, starts=offsets[0], ends=offsets[1],
+                         source_size=np.int64(st.st_size), source_mtime_ns=np.int64(st.st_mtime_ns))
+            os.replace(temp_path, sidecar_path)
+        except Exception as e:
+            log("warning", f"Warning: Could not write record index '{sidecar_path}': {e}")
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+
+
+RECORD_OFFSET_INDEX = RecordOffsetIndex()
+
+
+def _select_json_field(record_text, json_field):
+    """Value at a dotted path ('meta.caption', 'items.0') of a JSON record, as a string."""
+    value = json.loads(record_text)
+    for part in json_field.split('.'):
+        if isinstance(value, list):
+            value = value[int(part)]
+        else:
+            value = value[part]
+    return value if isinstance(value, str) else json.dumps(value, ensure_ascii=False)
+
+
+class LoadTextFromRecordIndex:
+    """
+      Loads one record (non-empty line) from a single large TXT or JSONL file by index,
+      optionally selecting a field of a JSON record. A byte-offset index is built once per
+      file version, so any record is fetched without reading the rest of the file.
+      """
+    def __init__(self):
+      pass
+
+    @classmethod
+    def INPUT_TYPES(cls):
+      return {
+          "required": {
+            "file_path": ("STRING", {"multiline": False, "default": ""}),
+            "record_index": ("INT", {"default": 0, "min": 0, "step": 1}),
+        },
+        "optional": {
+             "json_field": ("STRING", {"multiline": False, "default": "", "tooltip": "Dotted path of the field to output for JSONL records, e.g. 'prompt' or 'meta.caption'. Empty outputs the whole line."}),
+             "write_sidecar": ("BOOLEAN", {"default": True, "tooltip": "Save the record index next to the file so other processes can reuse it"}),
+        }
+      }
+
+    RETURN_TYPES = ("STRING", "INT")
+    RETURN_NAMES = ("text", "record_count")
+    FUNCTION = "load_record"
+    CATEGORY = "BETA Nodes"
+
+    @classmethod
+    def IS_CHANGED(cls, file_path = "", record_index = None, json_field = "", write_sidecar = True, **kwargs):
+      return _stat_fingerprint(file_path)
+
+    def load_record(self, file_path, record_index, json_field = "", write_sidecar = True):
+      if not file_path or not os.path.isfile(file_path):
+        log("warning", f"Warning: File path '{file_path}' is invalid or not found.")
+        return ("", 0)
+      try:
+          starts, _ = RECORD_OFFSET_INDEX.get_offsets(file_path, write_sidecar)
+      except Exception as e:
+          log("error", f"Error indexing records in '{file_path}': {e}")
+          return ("", 0)
+
+      num_records = len(starts)
+      if record_index >= num_records or record_index < 0:
+        log("warning", f"Warning: record index {record_index} out of range, it needs to be between 0 and {num_records-1} ")
+        return ("", num_records)
+
+      try:
+          text_content = RECORD_OFFSET_INDEX.read_record(file_path, record_index, write_sidecar)
+      except Exception as e:
+          log("error", f"Error reading record {record_index} of '{file_path}': {e}")
+          return ("", num_records)
+
+      if json_field:
+          try:
+              text_content = _select_json_field(text_content, json_field)
+          except Exception as e:
+              log("error", f"Error selecting field '{json_field}' from record {record_index}: {e}")
+              return ("", num_records)
+      log("info", f"Loaded record ({record_index + 1}/{num_records}) from '{file_path}'")
+      return (text_content, num_records)
+
+
 NODE_CLASS_MAPPINGS = { 
-    "LoadTextFromIndex": LoadTextFromIndex
+    "LoadTextFromIndex": LoadTextFromIndex,
+    "LoadTextBatchFromIndex": LoadTextBatchFromIndex,
+    "LoadTextFromRecordIndex": LoadTextFromRecordIndex,
  }
 
 NODE_DISPLAY_NAME_MAPPINGS = { 
-    "LoadTextFromIndex": "Load Text from index 📼 🅑🅔🅣🅐"
+    "LoadTextFromIndex": "Load Text from index 📼 🅑🅔🅣🅐",
+    "LoadTextBatchFromIndex": "Load Text batch from index 📼 🅑🅔🅣🅐",
+    "LoadTextFromRecordIndex": "Load Text record from file 📼 🅑🅔🅣🅐",
 }
\ No newline at end of file
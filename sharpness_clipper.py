@@ -1,6 +1,9 @@
 import torch
 import numpy as np
-import cv2
+from .lazy_imports import lazy_module
+from .image_convert import FrameConverter, frame_to_gray
+
+cv2 = lazy_module("cv2")
 
 class SharpestFrameClipper:
     """
@@ -10,7 +13,7 @@ class SharpestFrameClipper:
     Optionally skips frames with text overlays or mostly black/white content.
     """
     def __init__(self):
-        pass
+        self.converter = FrameConverter() # Reused uint8/grayscale buffers across executions
 
     @classmethod
     def INPUT_TYPES(cls):
@@ -30,31 +33,13 @@ class SharpestFrameClipper:
     FUNCTION = "clip_to_sharpest"
     CATEGORY = "Burgstall Enabling The Awesomeness"
 
-    def _image_to_numpy(self, image):
-        """Convert image to numpy array in uint8 format."""
-        if isinstance(image, torch.Tensor):
-            img_np = image.cpu().numpy()
-        else:
-            img_np = image
-        
-        if img_np.dtype != np.uint8:
-            img_np = (np.clip(img_np, 0, 1) * 255).astype(np.uint8)
-        
-        return img_np
-    
-    def _to_grayscale(self, img_np):
-        """Convert image to grayscale."""
-        if len(img_np.shape) == 3 and img_np.shape[2] == 3:
-            return cv2.cvtColor(img_np, cv2.COLOR_RGB2GRAY)
-        return img_np
-    
     def has_text_features(self, image):
         """
         Detect if an image has significant text-like features.
         Uses edge detection and horizontal/vertical line detection as heuristics.
+        image: IMAGE frame, or an already converted grayscale uint8 frame.
         """
-        img_np = self._image_to_numpy(image)
-        gray = self._to_grayscale(img_np)
+        gray = frame_to_gray(image)
         
         # Use Canny edge detection to find edges
         edges = cv2.Canny(gray, 50, 150)
@@ -90,9 +75,9 @@ class SharpestFrameClipper:
         """
         Check if an image is mostly black or white.
         threshold: proportion of pixels that must be black/white (0.0 to 1.0)
+        image: IMAGE frame, or an already converted grayscale uint8 frame.
         """
-        img_np = self._image_to_numpy(image)
-        gray = self._to_grayscale(img_np)
+        gray = frame_to_gray(image)
         
         # Count pixels that are very dark (black) or very bright (white)
         black_pixels = np.sum(gray < 10)  # Very dark
@@ -109,9 +94,9 @@ class SharpestFrameClipper:
         """
         Calculate the sharpness of an image using the variance of the Laplacian.
         Higher values indicate sharper images.
+        image: IMAGE frame, or an already converted grayscale uint8 frame.
         """
-        img_np = self._image_to_numpy(image)
-        gray = self._to_grayscale(img_np)
+        gray = frame_to_gray(image)
         
         # Calculate the Laplacian of the image and return the variance
         laplacian = cv2.Laplacian(gray, cv2.CV_64F)
@@ -140,35 +125,35 @@ class SharpestFrameClipper:
         sharpness_scores = []
         frame_info = []
         
-        for i in range(analysis_start, analysis_end):
-            frame = images[i]
-            
-            # Check if we should skip this frame
-            skip_frame = False
-            skip_reason = None
-            
-            if skip_text_frames:
-                if self.has_text_features(frame):
-                    skip_frame = True
-                    skip_reason = "text"
-            
-            if not skip_frame and skip_black_white_frames:
-                if self.is_mostly_black_or_white(frame, black_white_threshold):
-                    skip_frame = True
-                    skip_reason = "black/white"
-            
-            if skip_frame:
+        # Each chunk is converted to grayscale once and shared by all checks below
+        for chunk_indices, _, grays in self.converter.iter_chunks(images, range(analysis_start, analysis_end), rgb=False, gray=True):
+            for i, gray in zip(chunk_indices, grays):
+                # Check if we should skip this frame
+                skip_frame = False
+                skip_reason = None
+                
+                if skip_text_frames:
+                    if self.has_text_features(gray):
+                        skip_frame = True
+                        skip_reason = "text"
+                
+                if not skip_frame and skip_black_white_frames:
+                    if self.is_mostly_black_or_white(gray, black_white_threshold):
+                        skip_frame = True
+                        skip_reason = "black/white"
+                
+                if skip_frame:
+                    if show_debug:
+                        print(f"[Clip to Sharpest Frame] Skipping frame {i} (reason: {skip_reason})")
+                    continue
+                
+                # Calculate sharpness for this frame
+                sharpness = self.calculate_sharpness(gray)
+                sharpness_scores.append(sharpness)
+                frame_info.append((i, sharpness))
+                
                 if show_debug:
-                    print(f"[Clip to Sharpest Frame] Skipping frame {i} (reason: {skip_reason})")
-                continue
-            
-            # Calculate sharpness for this frame
-            sharpness = self.calculate_sharpness(frame)
-            sharpness_scores.append(sharpness)
-            frame_info.append((i, sharpness))
-            
-            if show_debug:
-                print(f"[Clip to Sharpest Frame] Frame {i}: sharpness = {sharpness:.2f}")
+                    print(f"[Clip to Sharpest Frame] Frame {i}: sharpness = {sharpness:.2f}")
         
         # Check if we have any valid frames
         if len(sharpness_scores) == 0:
@@ -196,7 +181,7 @@ class SelectSharpestFrames:
     from a window around each interval point.
     """
     def __init__(self):
-        pass
+        self.converter = FrameConverter() # Reused uint8/grayscale buffers across executions
 
     @classmethod
     def INPUT_TYPES(cls):
@@ -217,23 +202,10 @@ class SelectSharpestFrames:
         """
         Calculate the sharpness of an image using the variance of the Laplacian.
         Higher values indicate sharper images.
+        image: IMAGE frame, or an already converted grayscale uint8 frame.
         """
-        # Convert from tensor to numpy array if needed
-        if isinstance(image, torch.Tensor):
-            # Convert from (H, W, C) torch tensor to numpy array
-            img_np = image.cpu().numpy()
-        else:
-            img_np = image
-
-        # Ensure the image is in the correct format (0-255, uint8)
-        if img_np.dtype != np.uint8:
-            img_np = (img_np * 255).astype(np.uint8)
-
-        # Convert to grayscale for sharpness calculation
-        if len(img_np.shape) == 3 and img_np.shape[2] == 3:
-            gray = cv2.cvtColor(img_np, cv2.COLOR_RGB2GRAY)
-        else:
-            gray = img_np
+        # Clamped to 0..1 before the uint8 conversion (out-of-range values used to wrap around)
+        gray = frame_to_gray(image)
 
         # Calculate the Laplacian of the image and return the variance
         laplacian = cv2.Laplacian(gray, cv2.CV_64F)
@@ -251,9 +223,8 @@ class SelectSharpestFrames:
         rejected_frames = []
         
         # Start from frame 0 and iterate by interval
-        current_frame = 0
-        
-        while current_frame < batch_size:
+        windows = [] # (current_frame, window_start, window_end)
+        for current_frame in range(0, batch_size, interval):
             # Calculate the window around the current frame
             # We want exactly window_size frames centered around current_frame
             half_window = window_size // 2
@@ -263,17 +234,25 @@ class SelectSharpestFrames:
             ideal_end = current_frame + half_window + (window_size % 2)
             
             # Clamp to valid frame indices
-            window_start = max(0, ideal_start)
-            window_end = min(batch_size, ideal_end)
-            
-            # Calculate sharpness for each frame in the window
+            windows.append((current_frame, max(0, ideal_start), min(batch_size, ideal_end)))
+        
+        # Score every frame that falls in a window once (windows overlap when window_size > interval),
+        # converting them to grayscale chunk by chunk
+        needed = sorted({i for _, window_start, window_end in windows for i in range(window_start, window_end)})
+        sharpness_by_frame = {}
+        for chunk_indices, _, grays in self.converter.iter_chunks(images, needed, rgb=False, gray=True):
+            for i, gray in zip(chunk_indices, grays):
+                sharpness_by_frame[i] = self.calculate_sharpness(gray)
+        
+        for current_frame, window_start, window_end in windows:
+            # Pick the sharpest frame in the window
             best_sharpness = -1
             best_frame_idx = current_frame
             window_frames = []
             
             for i in range(window_start, window_end):
                 frame = images[i]
-                sharpness = self.calculate_sharpness(frame)
+                sharpness = sharpness_by_frame[i]
                 window_frames.append((i, frame, sharpness))
                 if sharpness > best_sharpness:
                     best_sharpness = sharpness
@@ -286,9 +265,6 @@ class SelectSharpestFrames:
             for frame_idx, frame, sharpness in window_frames:
                 if frame_idx != best_frame_idx:
                     rejected_frames.append(frame)
-            
-            # Move to the next interval
-            current_frame += interval
 
         # Handle empty results
         if len(selected_frames) == 0:
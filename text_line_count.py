@@ -1,3 +1,100 @@
+import random
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from .instrumentation import log
+
+# The same line boundaries str.splitlines() uses (\r\n counts as one)
+_LINE_BREAKS = '\n\r\v\f\x1c\x1d\x1e\x85\u2028\u2029'
+_LINE_BREAK_CODES = np.array([ord(c) for c in _LINE_BREAKS], dtype=np.uint32)
+_ASCII_LINE_BREAK = np.zeros(256, dtype=bool)
+_ASCII_LINE_BREAK[[c for c in _LINE_BREAK_CODES if c < 256]] = True
+
+
+def count_lines(text):
+    """len(text.splitlines()) with C-level str.count passes, without splitting."""
+    if not text:
+        return 0
+    # 'in' is a fast search that stops at the first hit, so only the separators
+    # that actually occur (usually just \n) cost a full counting pass
+    present = [c for c in _LINE_BREAKS if c in text]
+    breaks = sum(text.count(c) for c in present)
+    if '\r' in present and '\n' in present:
+        breaks -= text.count('\r\n')
+    # A trailing line break does not start another line
+    return breaks + (text[-1] not in _LINE_BREAKS)
+
+
+def _code_points(text):
+    """Code points of text as a numpy array (index i is character i)."""
+    if text.isascii():
+        return np.frombuffer(text.encode('ascii'), dtype=np.uint8)
+    return np.frombuffer(text.encode('utf-32-le', 'surrogatepass'), dtype=np.uint32)
+
+
+class LineOffsetIndex:
+    """
+    Start/end character offsets of every line of a text (splitlines() semantics),
+    so line counts and selections don't need to build a list of all lines.
+    The line breaks are located with one vectorized scan over the code points.
+    """
+    def __init__(self, text):
+        codes = _code_points(text)
+        size = len(codes)
+        is_break = _ASCII_LINE_BREAK[codes] if codes.dtype == np.uint8 else np.isin(codes, _LINE_BREAK_CODES)
+        breaks = np.flatnonzero(is_break)
+        # The \n of a \r\n pair belongs to the break that starts at the \r
+        after_cr = (codes[breaks] == 0x0a) & (breaks > 0) & (codes[np.maximum(breaks - 1, 0)] == 0x0d)
+        breaks = breaks[~after_cr]
+        crlf = (codes[breaks] == 0x0d) & (codes[np.minimum(breaks + 1, size - 1)] == 0x0a) & (breaks + 1 < size)
+        starts = np.concatenate(([0], breaks + 1 + crlf))
+        ends = breaks
+        if starts[-1] == size:
+            # A trailing line break does not start another line
+            starts = starts[:-1]
+        else:
+            ends = np.append(ends, size)
+        self.starts = starts
+        self.ends = ends
+
+    def __len__(self):
+        return len(self.starts)
+
+    def line(self, text, index):
+        return text[int(self.starts[index]):int(self.ends[index])]
+
+    def lines(self, text, start, stop):
+        return [text[s:e] for s, e in zip(self.starts[start:stop].tolist(), self.ends[start:stop].tolist())]
+
+
+_LINE_INDEX_CACHE = OrderedDict() # (len, hash) of the text -> (text, LineOffsetIndex)
+_LINE_INDEX_CACHE_SIZE = 16
+_LINE_INDEX_LOCK = threading.Lock()
+
+
+def get_line_index(text):
+    """
+    LineOffsetIndex for 'text', cached by its content. str hashes are computed once
+    per string object, and a hit on the same object is confirmed by identity, so
+    repeated lookups cost O(1) instead of hashing the whole text again.
+    """
+    key = (len(text), hash(text))
+    with _LINE_INDEX_LOCK:
+        entry = _LINE_INDEX_CACHE.get(key)
+        if entry is not None and (entry[0] is text or entry[0] == text):
+            _LINE_INDEX_CACHE.move_to_end(key)
+            return entry[1]
+    index = LineOffsetIndex(text)
+    with _LINE_INDEX_LOCK:
+        _LINE_INDEX_CACHE[key] = (text, index)
+        _LINE_INDEX_CACHE.move_to_end(key)
+        while len(_LINE_INDEX_CACHE) > _LINE_INDEX_CACHE_SIZE:
+            _LINE_INDEX_CACHE.popitem(last=False)
+    return index
+
+
 class TextLineCount:
     @classmethod
     def INPUT_TYPES(cls):
@@ -15,14 +112,58 @@ class TextLineCount:
     def count_lines(self, text):
         if not text:
             return (0,)
-        # Split by newline characters, including \r\n, \n, and \r
-        lines = text.splitlines()
-        return (len(lines),)
+        # Counts lines split by \n, \r\n, \r (and the other splitlines() separators)
+        # without materializing every line
+        return (count_lines(text),)
+
+
+class TextLineSelect:
+    """
+    Selects line N, a range of lines, or a seeded random line from a multiline text.
+    Uses a cached line offset index, so selecting many lines from the same text
+    never splits it again.
+    """
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                "text": ("STRING", {"multiline": True, "default": ""}),
+                "mode": (["index", "range", "random"], {"default": "index"}),
+                "line_index": ("INT", {"default": 0, "min": 0, "step": 1, "tooltip": "Line to output in 'index' mode, first line of the range in 'range' mode"}),
+                "count": ("INT", {"default": 1, "min": 1, "step": 1, "tooltip": "Number of lines in 'range' mode"}),
+                "seed": ("INT", {"default": 0, "min": 0, "max": 0xffffffffffffffff, "tooltip": "Seed for 'random' mode"}),
+            }
+        }
+
+    RETURN_TYPES = ("STRING", "INT", "INT")
+    RETURN_NAMES = ("text", "selected_index", "line_count")
+    FUNCTION = "select_lines"
+    CATEGORY = "BETA Nodes"
+
+    def select_lines(self, text, mode, line_index, count, seed):
+        if not text:
+            return ("", -1, 0)
+        index = get_line_index(text)
+        num_lines = len(index)
+
+        if mode == "random":
+            line_index = random.Random(seed).randrange(num_lines)
+        elif line_index >= num_lines:
+            log("warning", f"Warning: line index {line_index} out of range, it needs to be between 0 and {num_lines-1} ")
+            return ("", -1, num_lines)
+
+        if mode == "range":
+            stop = min(num_lines, line_index + count)
+            return ("\n".join(index.lines(text, line_index, stop)), line_index, num_lines)
+        return (index.line(text, line_index), line_index, num_lines)
+
 
 NODE_CLASS_MAPPINGS = {
-    "TextLineCount": TextLineCount
+    "TextLineCount": TextLineCount,
+    "TextLineSelect": TextLineSelect,
 }
 
 NODE_DISPLAY_NAME_MAPPINGS = {
-    "TextLineCount": "Text line count 🅑🅔🅣🅐"
-} 
\ No newline at end of file
+    "TextLineCount": "Text line count 🅑🅔🅣🅐",
+    "TextLineSelect": "Text line select 🅑🅔🅣🅐",
+}
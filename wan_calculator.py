@@ -1,11 +1,160 @@
 import torch
 import math
+import json
+import functools
+import numpy as np
+
+# Architecture figures used by the memory estimate.
+# vae_spatial/vae_temporal: VAE compression, patch: (t, h, w) transformer patch size.
+WAN_MODEL_PRESETS = {
+    "Wan2.1 1.3B": {"params": 1.3e9, "dim": 1536, "ffn_dim": 8960, "latent_channels": 16, "vae_spatial": 8, "vae_temporal": 4, "patch": (1, 2, 2), "max_frames": 81},
+    "Wan2.1 14B": {"params": 14e9, "dim": 5120, "ffn_dim": 13824, "latent_channels": 16, "vae_spatial": 8, "vae_temporal": 4, "patch": (1, 2, 2), "max_frames": 81},
+    "Wan2.2 TI2V 5B": {"params": 5e9, "dim": 3072, "ffn_dim": 14336, "latent_channels": 48, "vae_spatial": 16, "vae_temporal": 4, "patch": (1, 2, 2), "max_frames": 121},
+    "Wan2.2 A14B": {"params": 14e9, "dim": 5120, "ffn_dim": 13824, "latent_channels": 16, "vae_spatial": 8, "vae_temporal": 4, "patch": (1, 2, 2), "max_frames": 81},
+}
+
+# (weight bytes per parameter, activation bytes per element)
+WAN_PRECISION_PRESETS = {
+    "bf16/fp16": (2, 2),
+    "fp8": (1, 2),
+    "fp32": (4, 4),
+}
+
+_GB = 1024 ** 3
+_CUDA_OVERHEAD_BYTES = 1.0 * _GB # CUDA context, allocator fragmentation, text embeddings
+_VAE_DECODE_CHANNELS = 96 # Channels at full resolution in the WAN VAE decoder
+
+
+def estimate_wan_memory(width, height, frame_count, model_preset, precision):
+    """
+    Heuristic peak VRAM estimate for sampling and decoding a WAN video.
+    Assumes fully resident weights, cond/uncond batched together and
+    memory-efficient attention (activation memory linear in token count).
+    Returns a dict with the latent shape, token count and byte figures.
+    """
+    preset = WAN_MODEL_PRESETS[model_preset]
+    weight_bytes, act_bytes = WAN_PRECISION_PRESETS[precision]
+    patch_t, patch_h, patch_w = preset["patch"]
+
+    latent_frames = (max(1, frame_count) - 1) // preset["vae_temporal"] + 1
+    latent_height = math.ceil(height / preset["vae_spatial"])
+    latent_width = math.ceil(width / preset["vae_spatial"])
+    tokens = (math.ceil(latent_frames / patch_t) * math.ceil(latent_height / patch_h) * math.ceil(latent_width / patch_w))
+
+    weights = preset["params"] * weight_bytes
+    # Peak inside one transformer block: hidden state, residual, q/k/v and the
+    # attention output (6 x dim) plus the FFN intermediate, for cond + uncond.
+    activations = 2 * tokens * (6 * preset["dim"] + preset["ffn_dim"]) * act_bytes
+    latents = 4 * latent_frames * latent_height * latent_width * preset["latent_channels"] * 4
+    sampling_peak = weights + activations + latents
+    # The causal VAE decodes one latent frame (vae_temporal output frames) at a
+    # time; input, output and one intermediate buffer at full resolution.
+    decode_peak = 3 * preset["vae_temporal"] * width * height * _VAE_DECODE_CHANNELS * act_bytes + width * height * frame_count * 3 * 4
+
+    return {
+        "latent_shape": (preset["latent_channels"], latent_frames, latent_height, latent_width),
+        "tokens": tokens,
+        "weights_bytes": weights,
+        "activation_bytes": activations,
+        "decode_bytes": decode_peak,
+        "peak_bytes": max(sampling_peak, decode_peak) + _CUDA_OVERHEAD_BYTES,
+        "fixed_bytes": weights + _CUDA_OVERHEAD_BYTES, # independent of resolution and length
+    }
+
+
+_DEFAULT_WINDOW_FRAMES = 81
+
+
+def snap_to_frame_grid(frame_count, temporal=4):
+    """Largest frame count <= frame_count on the model-valid temporal*n+1 grid."""
+    return (max(1, frame_count) - 1) // temporal * temporal + 1
+
+
+def plan_wan_windows(frame_count, window_frames, overlap, temporal=4):
+    """
+    Splits frame_count frames into overlapping windows of at most window_frames
+    (snapped to the temporal*n+1 grid), or a single window if they all fit. The last window is shifted back so every
+    window has full length. Each window carries per-frame blend weights that
+    cross-fade linearly over the overlap, normalized so they sum to 1 per frame.
+    """
+    if frame_count <= window_frames:
+        # Fits into a single job
+        window_frames = frame_count
+    else:
+        # Never shorter than the first valid length, so every window has temporal context
+        window_frames = max(snap_to_frame_grid(window_frames, temporal), temporal + 1)
+    # Keep the stride at least half a window so mostly only neighbours overlap
+    overlap = max(0, min(overlap, window_frames // 2)) if frame_count > window_frames else 0
+    stride = window_frames - overlap
+
+    starts = [0]
+    while starts[-1] + window_frames < frame_count:
+        starts.append(min(starts[-1] + stride, frame_count - window_frames))
+
+    ramps = []
+    totals = [0.0] * frame_count
+    for i, start in enumerate(starts):
+        # Actual overlaps, the last window may overlap its predecessor by more than 'overlap'
+        fade_in = starts[i - 1] + window_frames - start if i > 0 else 0
+        fade_out = start + window_frames - starts[i + 1] if i + 1 < len(starts) else 0
+        ramp = [min(1.0, (k + 1) / (fade_in + 1), (window_frames - k) / (fade_out + 1)) for k in range(window_frames)]
+        for k, weight in enumerate(ramp):
+            totals[start + k] += weight
+        ramps.append(ramp)
+
+    windows = []
+    for start, ramp in zip(starts, ramps):
+        # Normalize so the weights of all windows covering a frame sum to 1
+        weights = [round(weight / totals[start + k], 4) for k, weight in enumerate(ramp)]
+        windows.append({"start": start, "end": start + window_frames, "blend_weights": weights})
+
+    return {
+        "frame_count": frame_count,
+        "window_frames": window_frames,
+        "overlap": overlap,
+        "windows": windows,
+    }
+
+
+_RESOLUTION_TABLE_MAX_DIM = 8192
+_RESOLUTION_CANDIDATES = 16 # Entries in the exported candidate list
+
+
+@functools.lru_cache(maxsize=4)
+def _resolution_table(multiple, max_dim=_RESOLUTION_TABLE_MAX_DIM):
+    """All (width, height) pairs of multiples of 'multiple' up to max_dim, sorted by aspect ratio."""
+    sides = np.arange(multiple, max_dim + 1, multiple, dtype=np.int64)
+    widths, heights = (a.ravel() for a in np.meshgrid(sides, sides))
+    aspects = widths / heights
+    order = np.argsort(aspects, kind="stable")
+    return aspects[order], widths[order], heights[order], (widths * heights)[order]
+
+
+def find_optimal_resolutions(target_pixels, aspect_ratio, multiple=16, aspect_tolerance=0.01):
+    """
+    Resolution pairs within aspect_tolerance (relative) of aspect_ratio and at or
+    under target_pixels, best first: largest area, then smallest aspect error.
+    The aspect band is found by binary search in the precomputed table.
+    Returns a list of (width, height, aspect_error).
+    """
+    aspects, widths, heights, areas = _resolution_table(multiple)
+    lo = np.searchsorted(aspects, aspect_ratio * (1 - aspect_tolerance), side="left")
+    hi = np.searchsorted(aspects, aspect_ratio * (1 + aspect_tolerance), side="right")
+    band = slice(lo, hi)
+    fits = areas[band] <= target_pixels
+    if not fits.any():
+        return []
+    errors = np.abs(aspects[band][fits] / aspect_ratio - 1)
+    order = np.lexsort((errors, -areas[band][fits]))[:_RESOLUTION_CANDIDATES]
+    return [(int(w), int(h), float(e)) for w, h, e in zip(widths[band][fits][order], heights[band][fits][order], errors[order])]
+
 
 class WANResolutionCalculator:
     """
     WAN Resolution Calculator - Calculates optimal model-friendly resolution 
     based on desired megapixel target and aspect ratio.
-    Outputs dimensions rounded to multiples of 16 for model compatibility.
+    Outputs dimensions rounded to multiples of 16 (configurable) for model compatibility,
+    either by flooring each side or by searching a table of all valid pairs.
     """
     def __init__(self):
         pass
@@ -23,16 +172,117 @@ class WANResolutionCalculator:
                 "source_height": ("INT", {"default": 1024, "min": 64, "max": 8192, "step": 16}),
             },
             "optional": {
-                "source_image": ("IMAGE",),
+                # Lazy: only evaluated when its shape is actually needed
+                "source_image": ("IMAGE", {"lazy": True}),
+                "video_info": ("VHS_VIDEOINFO", {"tooltip": "Video info from a VideoHelperSuite loader, provides dimensions and frame count without the frames"}),
+                # Resolution rounding
+                "rounding_mode": (["floor (legacy)", "optimal table"], {"default": "floor (legacy)", "tooltip": "'optimal table' picks the valid pair with the most pixels under the target within aspect_tolerance"}),
+                "resolution_multiple": ("INT", {"default": 16, "min": 8, "max": 128, "step": 8}),
+                "aspect_tolerance": ("FLOAT", {"default": 0.01, "min": 0.0, "max": 0.2, "step": 0.001, "tooltip": "Allowed relative aspect ratio error in 'optimal table' mode"}),
+                # Memory preflight: estimate peak VRAM for the chosen model/precision
+                "model_preset": (["none"] + list(WAN_MODEL_PRESETS), {"default": "none"}),
+                "precision": (list(WAN_PRECISION_PRESETS), {"default": "bf16/fp16"}),
+                "vram_budget_gb": ("FLOAT", {"default": 0.0, "min": 0.0, "max": 1024.0, "step": 0.5, "tooltip": "Available VRAM in GB for auto_fit, 0 disables fitting"}),
+                "auto_fit": (["off", "reduce_megapixels", "reduce_frames"], {"default": "off", "tooltip": "Shrink the resolution or frame count until the estimate fits vram_budget_gb"}),
+                # Long-video window planning
+                "snap_frame_count": ("BOOLEAN", {"default": False, "tooltip": "Snap frame_count down to the model-valid 4n+1 grid"}),
+                "window_overlap": ("INT", {"default": 16, "min": 0, "max": 1000, "step": 1, "tooltip": "Frames shared by consecutive windows in window_plan"}),
+                "max_window_frames": ("INT", {"default": 0, "min": 0, "max": 1000, "step": 1, "tooltip": "Frames per window, 0 derives it from the model preset and vram_budget_gb"}),
             },
         }
 
-    RETURN_TYPES = ("INT", "INT", "INT", "STRING")
-    RETURN_NAMES = ("width", "height", "frame_count", "info")
+    RETURN_TYPES = ("INT", "INT", "INT", "STRING", "FLOAT", "STRING", "STRING")
+    RETURN_NAMES = ("width", "height", "frame_count", "info", "estimated_vram_gb", "window_plan", "resolution_candidates")
     FUNCTION = "calculate_wan_resolution"
     CATEGORY = "Burgstall Enabling The Awesomeness"
 
-    def calculate_wan_resolution(self, frame_count, target_megapixels, use_custom_aspect_ratio, aspect_ratio_preset, custom_aspect_ratio, source_width, source_height, source_image=None):
+    def check_lazy_status(self, use_custom_aspect_ratio, video_info=None, **kwargs):
+        # Only the shape of source_image is used, skip evaluating the upstream
+        # batch when it would be ignored or video_info already has the dimensions
+        if use_custom_aspect_ratio or video_info is not None:
+            return []
+        # Unlinked inputs are absent from kwargs; linked but not yet evaluated ones are None
+        if "source_image" in kwargs and kwargs["source_image"] is None:
+            return ["source_image"]
+        return []
+
+    def _dimensions_for(self, target_megapixels, aspect_ratio, rounding=("floor (legacy)", 16, 0.01)):
+        rounding_mode, multiple, aspect_tolerance = rounding
+        # Calculate target pixels from megapixels
+        target_pixels = target_megapixels * 1_000_000
+
+        if rounding_mode == "optimal table":
+            candidates = find_optimal_resolutions(target_pixels, aspect_ratio, multiple, aspect_tolerance)
+            if candidates:
+                return candidates[0][:2]
+            # Nothing within tolerance (or beyond the table), fall back to flooring
+        
+        # Calculate dimensions using aspect ratio
+        # For aspect ratio (width = height × aspect_ratio)
+        # pixels = width × height = height² × aspect_ratio
+        # Therefore: height = sqrt(pixels / aspect_ratio)
+        height = math.sqrt(target_pixels / aspect_ratio)
+        width = height * aspect_ratio
+        
+        # Round to multiples of 16 (model-friendly)
+        return int(width // multiple) * multiple, int(height // multiple) * multiple
+
+    def _fit_to_budget(self, auto_fit, budget_bytes, target_megapixels, aspect_ratio, frame_count, model_preset, precision, rounding):
+        """Reduce megapixels (5% steps) or frames (one latent frame at a time) until the estimate fits."""
+        temporal = WAN_MODEL_PRESETS[model_preset]["vae_temporal"]
+        megapixels = target_megapixels
+        frames = frame_count
+        while True:
+            width, height = self._dimensions_for(megapixels, aspect_ratio, rounding)
+            estimate = estimate_wan_memory(width, height, frames, model_preset, precision)
+            if estimate["peak_bytes"] <= budget_bytes:
+                return width, height, frames, megapixels, estimate, True
+            if estimate["fixed_bytes"] > budget_bytes:
+                # The weights alone don't fit, shrinking the video won't help
+                width, height = self._dimensions_for(target_megapixels, aspect_ratio, rounding)
+                estimate = estimate_wan_memory(width, height, frame_count, model_preset, precision)
+                return width, height, frame_count, target_megapixels, estimate, False
+            if auto_fit == "reduce_megapixels" and megapixels * 0.95 >= 0.05:
+                megapixels *= 0.95
+            elif auto_fit == "reduce_frames" and frames - temporal >= 1:
+                frames -= temporal
+            else:
+                return width, height, frames, megapixels, estimate, False
+
+    def _window_frames_for(self, max_window_frames, width, height, model_preset, precision, vram_budget_gb, overlap):
+        """
+        Frames per window and a warning (or ""): explicit value, else the preset limit reduced
+        to the largest length that fits the budget, but not below the first valid length longer
+        than the overlap.
+        """
+        if max_window_frames > 0:
+            return max_window_frames, ""
+        if model_preset not in WAN_MODEL_PRESETS:
+            return _DEFAULT_WINDOW_FRAMES, ""
+        preset = WAN_MODEL_PRESETS[model_preset]
+        temporal = preset["vae_temporal"]
+        frames = preset["max_frames"]
+        if vram_budget_gb <= 0:
+            return frames, ""
+        budget_bytes = vram_budget_gb * _GB
+        estimate = estimate_wan_memory(width, height, frames, model_preset, precision)
+        if estimate["fixed_bytes"] > budget_bytes:
+            # The weights alone don't fit, shorter windows won't help
+            return frames, f", WARNING: weights exceed {vram_budget_gb:.1f}GB budget, windows not shortened"
+        min_frames = temporal + 1
+        while min_frames <= overlap and min_frames + temporal <= frames:
+            min_frames += temporal
+        while frames > min_frames and estimate["peak_bytes"] > budget_bytes:
+            frames = max(min_frames, frames - temporal)
+            estimate = estimate_wan_memory(width, height, frames, model_preset, precision)
+        if estimate["peak_bytes"] > budget_bytes:
+            return frames, f", WARNING: {frames}-frame windows exceed {vram_budget_gb:.1f}GB budget"
+        return frames, ""
+
+    def calculate_wan_resolution(self, frame_count, target_megapixels, use_custom_aspect_ratio, aspect_ratio_preset, custom_aspect_ratio, source_width, source_height, source_image=None,
+                                 video_info=None, rounding_mode="floor (legacy)", resolution_multiple=16, aspect_tolerance=0.01,
+                                 model_preset="none", precision="bf16/fp16", vram_budget_gb=0.0, auto_fit="off",
+                                 snap_frame_count=False, window_overlap=16, max_window_frames=0):
         # Define aspect ratio presets
         aspect_ratios = {
             "16:9": 16/9,      # 1.778
@@ -50,8 +300,15 @@ class WANResolutionCalculator:
         # Determine actual frame count and aspect ratio
         actual_frame_count = frame_count
         
-        # Determine aspect ratio to use - prioritize source image first
-        if source_image is not None and not use_custom_aspect_ratio:
+        # Determine aspect ratio to use - prioritize video info / source image first
+        if video_info is not None and not use_custom_aspect_ratio:
+            # Use the loaded (post frame-cap/resize) values of a VideoHelperSuite loader
+            width = video_info["loaded_width"]
+            height = video_info["loaded_height"]
+            actual_frame_count = video_info["loaded_frame_count"]
+            aspect_ratio = width / height
+            aspect_ratio_source = "video info"
+        elif source_image is not None and not use_custom_aspect_ratio:
             # Use source image aspect ratio and frame count when available and not overridden
             batch_size, height, width, channels = source_image.shape
             actual_frame_count = batch_size
@@ -70,19 +327,29 @@ class WANResolutionCalculator:
             aspect_ratio = aspect_ratios["16:9"]
             aspect_ratio_source = "default (16:9)"
             
-        # Calculate target pixels from megapixels
-        target_pixels = target_megapixels * 1_000_000
-        
-        # Calculate dimensions using aspect ratio
-        # For aspect ratio (width = height × aspect_ratio)
-        # pixels = width × height = height² × aspect_ratio
-        # Therefore: height = sqrt(pixels / aspect_ratio)
-        height = math.sqrt(target_pixels / aspect_ratio)
-        width = height * aspect_ratio
-        
-        # Round to multiples of 16 (model-friendly)
-        final_width = int(width // 16) * 16
-        final_height = int(height // 16) * 16
+        temporal = WAN_MODEL_PRESETS[model_preset]["vae_temporal"] if model_preset in WAN_MODEL_PRESETS else 4
+        if snap_frame_count:
+            actual_frame_count = snap_to_frame_grid(actual_frame_count, temporal)
+
+        rounding = (rounding_mode, resolution_multiple, aspect_tolerance)
+        final_width, final_height = self._dimensions_for(target_megapixels, aspect_ratio, rounding)
+
+        estimate = None
+        fit_note = ""
+        fitted_megapixels = target_megapixels
+        if model_preset in WAN_MODEL_PRESETS:
+            if auto_fit != "off" and vram_budget_gb > 0:
+                final_width, final_height, fitted_frames, fitted_megapixels, estimate, fits = self._fit_to_budget(
+                    auto_fit, vram_budget_gb * _GB, target_megapixels, aspect_ratio, actual_frame_count, model_preset, precision, rounding)
+                if fitted_frames != actual_frame_count or fitted_megapixels != target_megapixels:
+                    fit_note = f", auto-fit ({auto_fit}): {fitted_megapixels:.2f}MP target, {fitted_frames} frames"
+                if not fits:
+                    fit_note += f", WARNING: does not fit {vram_budget_gb:.1f}GB"
+                actual_frame_count = fitted_frames
+                if not fits:
+                    fitted_megapixels = target_megapixels
+            else:
+                estimate = estimate_wan_memory(final_width, final_height, actual_frame_count, model_preset, precision)
         
         # Calculate actual megapixels after rounding
         actual_megapixels = (final_width * final_height) / 1_000_000
@@ -91,8 +358,33 @@ class WANResolutionCalculator:
                         f"Final: {final_width}x{final_height} ({actual_megapixels:.2f}MP), "
                         f"{actual_frame_count} frames, "
                         f"Aspect: {aspect_ratio:.3f} ({aspect_ratio_source})")
+
+        estimated_vram_gb = 0.0
+        if estimate is not None:
+            estimated_vram_gb = estimate["peak_bytes"] / _GB
+            c, t, h, w = estimate["latent_shape"]
+            detailed_info += (f"\nLatent: {c}x{t}x{h}x{w} ({estimate['tokens']} tokens), "
+                              f"Est. peak VRAM ({model_preset}, {precision}): {estimated_vram_gb:.1f}GB "
+                              f"[weights {estimate['weights_bytes'] / _GB:.1f}GB, activations {estimate['activation_bytes'] / _GB:.1f}GB, "
+                              f"VAE decode {estimate['decode_bytes'] / _GB:.1f}GB]{fit_note}")
+            if vram_budget_gb > 0 and estimated_vram_gb > vram_budget_gb and auto_fit == "off":
+                detailed_info += f", WARNING: exceeds {vram_budget_gb:.1f}GB budget"
+        
+        window_frames, window_note = self._window_frames_for(max_window_frames, final_width, final_height, model_preset, precision, vram_budget_gb, window_overlap)
+        plan = plan_wan_windows(actual_frame_count, window_frames, window_overlap, temporal)
+        if len(plan["windows"]) > 1 or window_note:
+            detailed_info += (f"\nWindows: {len(plan['windows'])} x {plan['window_frames']} frames, "
+                              f"overlap {plan['overlap']}{window_note}")
+        
+        candidates = []
+        if rounding_mode == "optimal table":
+            # Alternatives at the (possibly auto-fitted) megapixel target, e.g. for batch planning
+            candidates = [
+                {"width": w, "height": h, "megapixels": round(w * h / 1_000_000, 4), "aspect_error": round(e, 5)}
+                for w, h, e in find_optimal_resolutions(fitted_megapixels * 1_000_000, aspect_ratio, resolution_multiple, aspect_tolerance)
+            ]
         
-        return (final_width, final_height, actual_frame_count, detailed_info)
+        return (final_width, final_height, actual_frame_count, detailed_info, estimated_vram_gb, json.dumps(plan), json.dumps(candidates))
 
 
 # Node Mappings